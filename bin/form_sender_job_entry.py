@@ -89,7 +89,8 @@ def atomic_write_json(path: Path, data: Dict[str, Any]) -> None:
     tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
     try:
         with tmp_path.open("w", encoding="utf-8") as handle:
-            json.dump(data, handle, ensure_ascii=False, indent=2)
+            # Runner 専用の中間ファイルのため整形せずコンパクトに書き出す（書き込み/読み込みバイト数を削減）
+            json.dump(data, handle, ensure_ascii=False, separators=(",", ":"))
             handle.flush()
             os.fsync(handle.fileno())
         os.replace(tmp_path, path)
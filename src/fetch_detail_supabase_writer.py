@@ -203,13 +203,21 @@ class SupabaseWriter:
         try:
             logger.info(f"早期終了時のクリーンアップ処理開始: batch_id={batch_id}")
             
-            # 処理済みレコードIDを抽出
-            processed_record_ids = [r.get('record_id') for r in results_data if r.get('record_id')]
-            processed_record_ids = [rid for rid in processed_record_ids if isinstance(rid, int)]
-            
-            # 成功・失敗結果を分離
-            successful_results = [r for r in results_data if r.get('status') == 'success' and r.get('record_id')]
-            failed_results = [r for r in results_data if r.get('status') == 'failed' and r.get('record_id')]
+            # 処理済みレコードIDの抽出と成功・失敗結果の分離を1パスで行う
+            processed_record_ids = []
+            successful_results = []
+            failed_results = []
+            for r in results_data:
+                record_id = r.get('record_id')
+                if not record_id:
+                    continue
+                if isinstance(record_id, int):
+                    processed_record_ids.append(record_id)
+                status = r.get('status')
+                if status == 'success':
+                    successful_results.append(r)
+                elif status == 'failed':
+                    failed_results.append(r)
             
             logger.info(f"処理済み件数: 成功={len(successful_results)}, 失敗={len(failed_results)}")
             logger.info(f"バッチ総数: {len(all_batch_record_ids)}, 処理済み: {len(processed_record_ids)}")
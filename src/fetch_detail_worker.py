@@ -12,6 +12,7 @@ import os
 import signal
 import sys
 import time
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Optional
@@ -36,6 +37,19 @@ except Exception:
     pass
 logger = logging.getLogger(__name__)
 
+# 致命的エラーパターンの定義（エラー毎に再生成しないようモジュール定数として保持）
+_FATAL_ERROR_PATTERNS = (
+    'timeout',  # タイムアウト系
+    'net::err_connection_refused',  # 接続拒否
+    'net::err_name_not_resolved',  # DNS解決失敗
+    'net::err_internet_disconnected',  # インターネット接続なし
+    'browser has been closed',  # ブラウザクローズ
+    'context has been closed',  # コンテキストクローズ
+)
+
+# エラー種別ごとに保持する直近メッセージ数（長時間稼働でのメモリ増加防止）
+_ERROR_PATTERN_HISTORY_SIZE = 50
+
 
 class TimeoutManager:
     """GitHub Actions タイムアウト管理クラス"""
@@ -141,7 +155,9 @@ class DetailWorker:
         # 連続エラー監視用
         self.consecutive_failures = 0
         self.total_fatal_errors = 0
-        self.error_patterns = {}
+        # エラー種別ごとの直近メッセージ（上限付き）と累計件数
+        self.error_patterns: Dict[str, deque] = {}
+        self.error_pattern_counts: Dict[str, int] = {}
         
         # 早期終了設定（標準化エラーハンドリング）
         from form_sender.utils.error_handler import load_config_safe
@@ -180,18 +196,7 @@ class DetailWorker:
     def is_fatal_error_pattern(self, error: Exception) -> bool:
         """致命的なエラーパターンかどうかを判定"""
         error_str = str(error).lower()
-        
-        # 致命的エラーパターンの定義
-        fatal_patterns = [
-            'timeout',  # タイムアウト系
-            'net::err_connection_refused',  # 接続拒否
-            'net::err_name_not_resolved',  # DNS解決失敗
-            'net::err_internet_disconnected',  # インターネット接続なし
-            'browser has been closed',  # ブラウザクローズ
-            'context has been closed',  # コンテキストクローズ
-        ]
-        
-        return any(pattern in error_str for pattern in fatal_patterns)
+        return any(pattern in error_str for pattern in _FATAL_ERROR_PATTERNS)
     
     def update_error_statistics(self, error: Exception, is_success: bool):
         """エラー統計を更新"""
@@ -208,9 +213,11 @@ class DetailWorker:
             error_type = type(error).__name__
             error_message = str(error)
             
-            if error_type not in self.error_patterns:
-                self.error_patterns[error_type] = []
-            self.error_patterns[error_type].append(error_message)
+            recent = self.error_patterns.get(error_type)
+            if recent is None:
+                recent = self.error_patterns[error_type] = deque(maxlen=_ERROR_PATTERN_HISTORY_SIZE)
+            recent.append(error_message)
+            self.error_pattern_counts[error_type] = self.error_pattern_counts.get(error_type, 0) + 1
             
             # 致命的エラーカウント
             if self.is_fatal_error_pattern(error):
@@ -231,6 +238,19 @@ class DetailWorker:
         signal.signal(signal.SIGINT, signal_handler)
         logger.info("シグナルハンドラ設定完了")
     
+    @staticmethod
+    def _count_results_by_status(results: List[Dict[str, Any]]) -> tuple[int, int]:
+        """成功/失敗件数を1パスで数える（件数しか使わないためリストは作らない）"""
+        successful_count = 0
+        failed_count = 0
+        for r in results:
+            status = r['status']
+            if status == 'success':
+                successful_count += 1
+            elif status == 'failed':
+                failed_count += 1
+        return successful_count, failed_count
+
     def should_terminate_batch(self, processed_count: int) -> tuple[bool, str]:
         """バッチ処理を早期終了すべきかどうかを判定"""
         # シグナルによる終了要求
@@ -403,13 +423,12 @@ class DetailWorker:
             all_batch_record_ids = [rid for rid in all_batch_record_ids if isinstance(rid, int)]
             
             # 統計情報計算
-            successful = [r for r in results if r['status'] == 'success']
-            failed = [r for r in results if r['status'] == 'failed']
+            successful_count, failed_count = self._count_results_by_status(results)
             
             intermediate_summary = {
                 'total_processed': len(results),
-                'total_successful': len(successful),
-                'total_failed': len(failed),
+                'total_successful': successful_count,
+                'total_failed': failed_count,
                 'results': results,
                 'execution_time': sum(r.get('execution_time', 0) for r in results),
                 'timestamp': datetime.now().isoformat(),
@@ -422,7 +441,7 @@ class DetailWorker:
                 # エラー統計情報
                 'consecutive_failures': self.consecutive_failures,
                 'total_fatal_errors': self.total_fatal_errors,
-                'error_patterns': {k: len(v) for k, v in self.error_patterns.items()},
+                'error_patterns': dict(self.error_pattern_counts),
                 'fatal_error_ratio': self.total_fatal_errors / len(results) if results else 0,
                 # バッチ情報（Supabaseクリーンアップ用）
                 'all_batch_record_ids': all_batch_record_ids,
@@ -439,7 +458,7 @@ class DetailWorker:
                 json.dump(intermediate_summary, f, ensure_ascii=False, indent=2)
             
             logger.info(f"中間結果保存完了: {results_file}")
-            logger.info(f"保存内容: 成功={len(successful)}, 失敗={len(failed)}, タイムアウト={timeout_summary['timeout_triggered']}")
+            logger.info(f"保存内容: 成功={successful_count}, 失敗={failed_count}, タイムアウト={timeout_summary['timeout_triggered']}")
             
             return True
             
@@ -572,8 +591,7 @@ class DetailWorker:
                 break
         
         # 統計情報計算
-        successful = [r for r in results if r['status'] == 'success']
-        failed = [r for r in results if r['status'] == 'failed']
+        successful_count, failed_count = self._count_results_by_status(results)
         
         # バッチ全体のrecord_idリストを作成
         all_batch_record_ids = [task.get('record_id') for task in batch_data]
@@ -584,8 +602,8 @@ class DetailWorker:
         
         summary = {
             'total_processed': len(results),
-            'total_successful': len(successful),
-            'total_failed': len(failed),
+            'total_successful': successful_count,
+            'total_failed': failed_count,
             'results': results,
             'execution_time': sum(r['execution_time'] for r in results),
             'timestamp': datetime.now().isoformat(),
@@ -599,7 +617,7 @@ class DetailWorker:
             # エラー統計情報
             'consecutive_failures': self.consecutive_failures,
             'total_fatal_errors': self.total_fatal_errors,
-            'error_patterns': {k: len(v) for k, v in self.error_patterns.items()},
+            'error_patterns': dict(self.error_pattern_counts),
             'fatal_error_ratio': self.total_fatal_errors / len(results) if results else 0,
             # バッチ情報（Supabaseクリーンアップ用）
             'all_batch_record_ids': all_batch_record_ids,
@@ -609,11 +627,11 @@ class DetailWorker:
         # ログ出力の改善
         if terminated_early:
             if timeout_summary['timeout_triggered']:
-                logger.warning(f"タイムアウト対応による早期終了: 成功={len(successful)}, 失敗={len(failed)}, 経過時間={timeout_summary['elapsed_minutes']:.1f}分")
+                logger.warning(f"タイムアウト対応による早期終了: 成功={successful_count}, 失敗={failed_count}, 経過時間={timeout_summary['elapsed_minutes']:.1f}分")
             else:
-                logger.warning(f"バッチ処理早期終了: 成功={len(successful)}, 失敗={len(failed)}, 理由: {termination_reason}")
+                logger.warning(f"バッチ処理早期終了: 成功={successful_count}, 失敗={failed_count}, 理由: {termination_reason}")
         else:
-            logger.info(f"バッチ処理完了: 成功={len(successful)}, 失敗={len(failed)}")
+            logger.info(f"バッチ処理完了: 成功={successful_count}, 失敗={failed_count}")
         
         # タイムアウト情報のログ
         if timeout_summary['warning_issued']:
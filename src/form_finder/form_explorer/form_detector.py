@@ -8,6 +8,7 @@ GitHub Actions対応フォーム検出クラス（本家準拠版）
 
 import logging
 import re
+from collections import Counter
 from typing import List, Dict, Any, Optional
 from config.manager import get_form_finder_rules
 from form_sender.security.log_sanitizer import sanitize_for_log
@@ -161,13 +162,9 @@ class FormDetector:
                     logger.debug(f"品質チェック不合格: {form_data.get('source', 'unknown')}領域 ({form_type})")
             
             if validated_forms:
-                # フォームタイプ別統計
-                form_types = {}
-                for form in validated_forms:
-                    form_type = form.get('formType', 'standard')
-                    form_types[form_type] = form_types.get(form_type, 0) + 1
-                
-                if form_types:
+                # フォームタイプ別統計（DEBUG 出力時のみ集計）
+                if logger.isEnabledFor(logging.DEBUG):
+                    form_types = Counter(form.get('formType', 'standard') for form in validated_forms)
                     logger.debug(f"フォームタイプ別統計: {dict(form_types)}")
                 
                 # 複数フォーム処理（本家準拠強化）
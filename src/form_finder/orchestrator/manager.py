@@ -14,7 +14,7 @@ import time
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 from ..worker.isolated_worker import worker_process_main
 from form_sender.communication.queue_manager import (
@@ -24,7 +24,6 @@ from form_sender.communication.queue_manager import (
     QueueOverflowError,
     WorkerCommunicationError,
 )
-from form_sender.security.log_sanitizer import sanitize_for_log
 from config.manager import get_worker_config
 from utils.env import is_github_actions
 
@@ -34,6 +33,13 @@ logger = logging.getLogger(__name__)
 ARTIFACTS_DIR = Path("artifacts")
 ARTIFACTS_DIR.mkdir(exist_ok=True)
 
+# 完了系ステータス -> バッチ統計キー（完了判定と集計先の決定を1回の辞書引きで行う）
+_BATCH_STAT_KEY_BY_STATUS = {
+    ResultStatus.SUCCESS: "success_count",
+    ResultStatus.FAILED: "failed_count",
+    ResultStatus.ERROR: "error_count",
+}
+
 
 class FormFinderOrchestrator:
     """Form Finderマルチプロセス・オーケストレーター管理クラス"""
@@ -60,9 +66,11 @@ class FormFinderOrchestrator:
         self._status_lock = threading.Lock()
 
         # 処理統計
-        self.start_time = time.time()
+        # 経過時間計算は monotonic（NTP 補正で負にならない）、表示用の開始時刻は壁時計で保持
+        self.start_time = time.monotonic()
+        self.start_wall = time.time()
         self.orchestrator_stats = {
-            "start_time": self.start_time,
+            "start_time": self.start_wall,
             "batches_processed": 0,
             "total_companies_sent": 0,
             "total_results_received": 0,
@@ -71,10 +79,12 @@ class FormFinderOrchestrator:
 
         # 結果収集用
         self.results = []
+        # 結果リストとフォーム探索統計は常に同時に更新・参照するため、1つのロックで保護する
+        # （results_lock / stats_lock は同一ロックの別名）
         self.results_lock = threading.Lock()
         
         # フォーム探索統計（スレッドセーフ）
-        self.stats_lock = threading.Lock()
+        self.stats_lock = self.results_lock
         self.total_processed = 0
         self.total_successful = 0    # 技術的成功（エラーなし）
         self.total_failed = 0        # 技術的失敗（エラーあり）
@@ -82,6 +92,12 @@ class FormFinderOrchestrator:
         self.business_failed = 0     # ビジネス失敗（フォーム未発見）
         self.total_forms_found = 0   # 総フォーム発見数
 
+        # 監視タスクが記録した最新のワーカー健康状態と記録時刻（monotonic）。
+        # バッチループはこれを再利用し、監視間隔より古い場合のみ直接確認する
+        self.last_health_status: Dict[int, str] = {}
+        self.last_health_check_at = float("-inf")
+        self.health_check_interval: float = 30
+
         # 制御フラグ
         self.is_running = False
         self.should_stop = False
@@ -97,11 +113,14 @@ class FormFinderOrchestrator:
             check_interval: チェック間隔（秒）
         """
         logger.info(f"Starting worker monitoring task (interval: {check_interval}s)")
+        self.health_check_interval = check_interval
 
         while self.is_running and not self.should_stop:
             try:
                 # ヘルスチェック
                 health_status = self.check_worker_health()
+                self.last_health_status = health_status
+                self.last_health_check_at = time.monotonic()
                 unhealthy_workers = [
                     w_id for w_id, status in health_status.items() if status in ["dead", "unresponsive"]
                 ]
@@ -153,11 +172,18 @@ class FormFinderOrchestrator:
 
             # ワーカーの準備完了を待機
             ready_worker_ids = set()
-            timeout_start = time.time()
+            timeout_start = time.monotonic()
             max_startup_time = 60  # 最大60秒で起動
 
-            while len(ready_worker_ids) < self.num_workers and (time.time() - timeout_start) < max_startup_time:
-                results = self.queue_manager.get_all_available_results()
+            while len(ready_worker_ids) < self.num_workers:
+                remaining = max_startup_time - (time.monotonic() - timeout_start)
+                if remaining <= 0:
+                    break
+
+                # 固定間隔のポーリングではなく、READY 通知の到着で即座に起床する
+                results = await asyncio.to_thread(
+                    self.queue_manager.get_results_blocking, min(1.0, remaining)
+                )
 
                 for result in results:
                     if result.status == ResultStatus.WORKER_READY and result.worker_id not in ready_worker_ids:
@@ -166,9 +192,6 @@ class FormFinderOrchestrator:
                             self.worker_status[result.worker_id] = "ready"
                         logger.info(f"Form Finder Worker {result.worker_id} is ready ({len(ready_worker_ids)}/{self.num_workers})")
 
-                if len(ready_worker_ids) < self.num_workers:
-                    await asyncio.sleep(1)
-
             if len(ready_worker_ids) == self.num_workers:
                 logger.info("All form finder workers are ready!")
                 self.is_running = True
@@ -191,7 +214,7 @@ class FormFinderOrchestrator:
         if not self.is_running:
             raise RuntimeError("Workers are not running")
 
-        batch_start_time = time.time()
+        batch_start_time = time.monotonic()
         batch_stats = {
             "companies_sent": 0,
             "results_received": 0,
@@ -304,42 +327,51 @@ class FormFinderOrchestrator:
                 logger.warning(f"Could not load batch timeout from config, using default 40 minutes: {e}")
                 max_wait_time = 2400
             
-            last_activity = time.time()
-
-            while pending_tasks > 0 and (time.time() - batch_start_time) < max_wait_time:
-                results = self.queue_manager.get_all_available_results()
+            # 時刻取得はループ1周につき1回（tick）に集約する
+            tick = time.monotonic()
+            last_activity = tick
+            next_progress_log = tick + 30
+            # 結果ごとのデバッグログは本番では無効のため、レベル判定はバッチ開始時に1回だけ行う
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+            while pending_tasks > 0 and (tick - batch_start_time) < max_wait_time:
+                if self.queue_manager.has_results():
+                    results = self.queue_manager.get_all_available_results()
+                else:
+                    # 結果待ちは固定スリープではなく、到着した時点で起床する（最大0.5秒）
+                    results = await self._wait_for_results(0.5)
+                received = False
 
+                # 取得済みの結果をステータスで1パス仕分けし、収集はまとめて1回で行う
+                completed = []
                 for result in results:
-                    if result.status in [ResultStatus.SUCCESS, ResultStatus.FAILED, ResultStatus.ERROR]:
+                    stat_key = _BATCH_STAT_KEY_BY_STATUS.get(result.status)
+                    if stat_key is not None:
                         pending_tasks -= 1
-                        batch_stats["results_received"] += 1
-                        self.orchestrator_stats["total_results_received"] += 1
-                        last_activity = time.time()
-
-                        # 結果を収集
-                        await self._collect_worker_result(result)
+                        batch_stats[stat_key] += 1
+                        completed.append(result)
 
-                        # 統計更新
-                        if result.status == ResultStatus.SUCCESS:
-                            batch_stats["success_count"] += 1
-                        elif result.status == ResultStatus.FAILED:
-                            batch_stats["failed_count"] += 1
-                        else:  # ERROR
-                            batch_stats["error_count"] += 1
+                        if debug_enabled:
+                            logger.debug(f"Processed result for company {result.record_id}: {result.status.value}")
 
-                        logger.debug(f"Processed result for company {result.record_id}: {result.status.value}")
+                if completed:
+                    batch_stats["results_received"] += len(completed)
+                    self.orchestrator_stats["total_results_received"] += len(completed)
+                    received = True
 
-                # 結果がなかった場合の待機
-                if not results:
-                    await asyncio.sleep(0.5)
+                    # 結果を収集
+                    await self._collect_worker_results(completed)
 
                 # 進捗監視とタイムアウトチェック
-                current_time = time.time()
-                elapsed_wait_time = current_time - last_activity
-                total_elapsed = current_time - batch_start_time
+                tick = time.monotonic()
+                if received:
+                    last_activity = tick
+                elapsed_wait_time = tick - last_activity
+                total_elapsed = tick - batch_start_time
                 
-                # 30秒間隔で詳細な進捗ログを出力
-                if elapsed_wait_time > 30:
+                # 無活動が30秒を超えたら、30秒間隔で詳細な進捗ログを出力
+                if elapsed_wait_time > 30 and tick >= next_progress_log:
+                    next_progress_log = tick + 30
                     completed_count = len(task_ids) - pending_tasks
                     completion_rate = (completed_count / len(task_ids)) * 100 if task_ids else 0
                     estimated_remaining_time = (total_elapsed / completed_count * pending_tasks) if completed_count > 0 else 0
@@ -350,9 +382,8 @@ class FormFinderOrchestrator:
                     
                     # 10分間無活動の場合は警告
                     if elapsed_wait_time > 600:
-                        logger.warning(f"⚠️ 10分間処理活動がありません。ワーカーの状態を確認中...")
-                        health_status = self.check_worker_health()
-                        logger.warning(f"ワーカー健康状態: {health_status}")
+                        logger.warning(f"⚠️ 10分間処理活動がありません。ワーカー健康状態: "
+                                       f"{self._recent_health_status()}")
                         
                     # 20分間無活動の場合は詳細分析
                     if elapsed_wait_time > 1200:
@@ -361,19 +392,19 @@ class FormFinderOrchestrator:
                         logger.error(f"キューマネージャー統計: {queue_stats}")
 
             # バッチ処理完了
-            batch_elapsed = time.time() - batch_start_time
+            batch_elapsed = time.monotonic() - batch_start_time
             self.orchestrator_stats["batches_processed"] += 1
 
-            # 統計情報をサニタイズしてログ出力
-            safe_batch_stats = sanitize_for_log(batch_stats)
-            logger.info(
-                f"バッチ処理完了: 送信={safe_batch_stats['companies_sent']}件, "
-                f"受信={safe_batch_stats['results_received']}件, "
-                f"成功={safe_batch_stats['success_count']}件, "
-                f"失敗={safe_batch_stats['failed_count']}件, "
-                f"エラー={safe_batch_stats['error_count']}件, "
-                f"処理時間={batch_elapsed:.2f}秒"
-            )
+            # 統計情報は件数（int）のみで機微情報を含まないため、サニタイズせずに直接ログ出力
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"バッチ処理完了: 送信={batch_stats['companies_sent']}件, "
+                    f"受信={batch_stats['results_received']}件, "
+                    f"成功={batch_stats['success_count']}件, "
+                    f"失敗={batch_stats['failed_count']}件, "
+                    f"エラー={batch_stats['error_count']}件, "
+                    f"処理時間={batch_elapsed:.2f}秒"
+                )
 
             if pending_tasks > 0:
                 incomplete_rate = (pending_tasks / len(task_ids)) * 100 if task_ids else 0
@@ -398,6 +429,36 @@ class FormFinderOrchestrator:
             logger.error(f"Error processing companies batch: {e}")
             raise
 
+    def _recent_health_status(self) -> Dict[int, str]:
+        """
+        直近のワーカー健康状態を取得
+        
+        監視タスク（monitor_and_recover_workers）の記録が監視間隔以内なら再利用し、
+        古い場合（監視タスク未起動・停止時）は直接確認して記録を更新する。
+        """
+        if time.monotonic() - self.last_health_check_at > self.health_check_interval:
+            self.last_health_status = self.check_worker_health()
+            self.last_health_check_at = time.monotonic()
+        return self.last_health_status
+
+    async def _wait_for_results(self, timeout: float) -> List[WorkerResult]:
+        """
+        結果の到着を別スレッドで最大 timeout 秒待機して取得
+        
+        停止時にこのコルーチンがキャンセルされても待機スレッドはキューからの取り出しを続けるため、
+        取り出された結果は捨てずに収集してからキャンセルを伝播する。
+        """
+        wait = asyncio.ensure_future(asyncio.to_thread(self.queue_manager.get_results_blocking, timeout))
+        try:
+            return await asyncio.shield(wait)
+        except asyncio.CancelledError:
+            late_results = await wait
+            completed = [r for r in late_results if r.status in _BATCH_STAT_KEY_BY_STATUS]
+            if completed:
+                logger.info(f"キャンセル中に受信した結果を収集: {len(completed)}件")
+                await self._collect_worker_results(completed)
+            raise
+
     async def _collect_worker_result(self, result: WorkerResult):
         """
         ワーカー結果を収集・変換
@@ -405,44 +466,69 @@ class FormFinderOrchestrator:
         Args:
             result: ワーカー処理結果
         """
-        try:
-            # ワーカー結果をform_finder形式に変換（完全スレッドセーフ版）
-            additional_data = result.additional_data or {}
-            form_urls = additional_data.get('form_urls', [])
-            
-            form_finder_result = {
-                'record_id': result.record_id,
-                'form_urls': form_urls,
-                'form_found': result.status == ResultStatus.SUCCESS and len(form_urls) > 0,
-                'status': 'success' if result.status == ResultStatus.SUCCESS else 'failed',
-                'business_status': 'success' if len(form_urls) > 0 else 'failed',
-                'error_message': result.error_message if result.status != ResultStatus.SUCCESS else None,
-                'processed_at': datetime.utcnow().isoformat(),
-                'exploration_details': additional_data.get('exploration_details', {})
-            }
+        await self._collect_worker_results((result,))
 
-            # 結果リストとすべての統計をアトミックに更新
-            with self.results_lock:
-                self.results.append(form_finder_result)
-                
-            with self.stats_lock:
-                self.total_processed += 1
+    async def _collect_worker_results(self, results: Iterable[WorkerResult]):
+        """
+        ワーカー結果をまとめて収集・変換
 
-                # 技術的成功・失敗のカウント
-                if result.status == ResultStatus.SUCCESS:
-                    self.total_successful += 1
-                else:
-                    self.total_failed += 1
+        変換はロック外で行い、結果リストと統計への反映はロック1回で済ませる
 
-                # ビジネス成功・失敗のカウント
-                if form_finder_result['business_status'] == 'success':
-                    self.business_successful += 1
-                    self.total_forms_found += len(form_finder_result['form_urls'])
-                else:
-                    self.business_failed += 1
+        Args:
+            results: ワーカー処理結果
+        """
+        records = []
+        successful = failed = business_successful = business_failed = forms_found = 0
+        processed_at = datetime.utcnow().isoformat()
 
-        except Exception as e:
-            logger.error(f"Error collecting worker result: {e}")
+        for result in results:
+            try:
+                # ワーカー結果をform_finder形式に変換
+                additional_data = result.additional_data or {}
+                form_urls = additional_data.get('form_urls', [])
+                # 成否・フォーム数は1回だけ求め、結果の組み立てと統計更新で共用する
+                is_success = result.status == ResultStatus.SUCCESS
+                form_count = len(form_urls)
+
+                records.append({
+                    'record_id': result.record_id,
+                    'form_urls': form_urls,
+                    'form_found': is_success and form_count > 0,
+                    'status': 'success' if is_success else 'failed',
+                    'business_status': 'success' if form_count > 0 else 'failed',
+                    'error_message': None if is_success else result.error_message,
+                    'processed_at': processed_at,
+                    'exploration_details': additional_data.get('exploration_details', {})
+                })
+            except Exception as e:
+                logger.error(f"Error collecting worker result: {e}")
+                continue
+
+            # 技術的成功・失敗のカウント
+            if is_success:
+                successful += 1
+            else:
+                failed += 1
+
+            # ビジネス成功・失敗のカウント
+            if form_count > 0:
+                business_successful += 1
+                forms_found += form_count
+            else:
+                business_failed += 1
+
+        if not records:
+            return
+
+        # 結果リストとすべての統計をアトミックに更新（ロック取得は1回）
+        with self.stats_lock:
+            self.results.extend(records)
+            self.total_processed += len(records)
+            self.total_successful += successful
+            self.total_failed += failed
+            self.business_successful += business_successful
+            self.business_failed += business_failed
+            self.total_forms_found += forms_found
 
     def validate_company_data(self, company_data: Dict[str, Any]) -> bool:
         """
@@ -511,25 +597,28 @@ class FormFinderOrchestrator:
 
     def calculate_form_discovery_rate(self) -> float:
         """フォーム発見率を計算（スレッドセーフ版）"""
+        with self.stats_lock:
+            return self._discovery_rate(self.business_successful, self.total_processed)
+
+    @staticmethod
+    def _discovery_rate(business_successful: int, total_processed: int) -> float:
+        """発見率（%、小数1桁）を算出"""
         try:
-            with self.stats_lock:
-                if self.total_processed <= 0:
-                    return 0.0
-                rate = (self.business_successful / self.total_processed) * 100
-                return round(rate, 1)
+            if total_processed <= 0:
+                return 0.0
+            rate = (business_successful / total_processed) * 100
+            return round(rate, 1)
         except (ZeroDivisionError, TypeError, ValueError):
             return 0.0
 
     def save_results(self):
         """処理結果をJSONファイルに保存（スレッドセーフ版）"""
         try:
-            execution_time = time.time() - self.start_time
+            execution_time = time.monotonic() - self.start_time
 
-            # データを一括でスナップショット取得
-            with self.results_lock:
-                results_snapshot = self.results.copy()
-            
+            # データを一括でスナップショット取得（結果と統計を同一ロック内で揃える）
             with self.stats_lock:
+                results_snapshot = self.results.copy()
                 stats_snapshot = {
                     'total_processed': self.total_processed,
                     'total_successful': self.total_successful,
@@ -545,13 +634,16 @@ class FormFinderOrchestrator:
                 'processed_at': datetime.utcnow().isoformat(),
                 'execution_time': round(max(0, execution_time), 2),
                 **stats_snapshot,
-                'form_discovery_rate': self.calculate_form_discovery_rate(),
+                'form_discovery_rate': self._discovery_rate(
+                    stats_snapshot['business_successful'], stats_snapshot['total_processed']
+                ),
                 'results': results_snapshot
             }
 
+            # 結果ファイルは機械処理（jq / Supabase書き込み）専用のため、インデントなしのコンパクト形式で出力
             results_file = ARTIFACTS_DIR / 'form_finder_results.json'
             with open(results_file, 'w', encoding='utf-8') as f:
-                json.dump(results_data, f, ensure_ascii=False, indent=2)
+                json.dump(results_data, f, ensure_ascii=False, separators=(',', ':'))
 
             logger.info(f"結果ファイル保存完了: {results_file}")
 
@@ -630,25 +722,35 @@ class FormFinderOrchestrator:
         Returns:
             Dict[str, Any]: 処理サマリー
         """
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.monotonic() - self.start_time
+
+        # 統計はロック1回で一貫したスナップショットを取り、以降はローカル変数から組み立てる
+        with self.stats_lock:
+            processed = self.total_processed
+            successful = self.total_successful
+            failed = self.total_failed
+            business_successful = self.business_successful
+            business_failed = self.business_failed
+            forms_found = self.total_forms_found
+        orch_stats = self.orchestrator_stats
 
         return {
             "processing_mode": "multi_process",
             "batch_id": self.batch_id,
             "num_workers": self.num_workers,
             "total_companies": len(self.batch_data),
-            "processed_count": self.total_processed,
-            "success_count": self.total_successful,
-            "failed_count": self.total_failed,
-            "business_successful_count": self.business_successful,
-            "business_failed_count": self.business_failed,
-            "total_forms_found": self.total_forms_found,
-            "form_discovery_rate": self.calculate_form_discovery_rate(),
+            "processed_count": processed,
+            "success_count": successful,
+            "failed_count": failed,
+            "business_successful_count": business_successful,
+            "business_failed_count": business_failed,
+            "total_forms_found": forms_found,
+            "form_discovery_rate": self._discovery_rate(business_successful, processed),
             "elapsed_time": elapsed_time,
             "orchestrator_stats": {
-                "batches_processed": self.orchestrator_stats["batches_processed"],
-                "total_companies_sent": self.orchestrator_stats["total_companies_sent"],
-                "total_results_received": self.orchestrator_stats["total_results_received"],
+                "batches_processed": orch_stats["batches_processed"],
+                "total_companies_sent": orch_stats["total_companies_sent"],
+                "total_results_received": orch_stats["total_results_received"],
             },
             "worker_health": self.check_worker_health(),
             "queue_stats": self.queue_manager.get_stats(),
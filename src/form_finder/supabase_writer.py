@@ -7,12 +7,29 @@ import json
 import logging
 import os
 # datetime 未使用：不要インポートを削除
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from supabase import create_client, Client
 
+from .utils import is_valid_form_url
+
 logger = logging.getLogger(__name__)
 
+# form_url の最大長（URLとして妥当な範囲）
+MAX_FORM_URL_LENGTH = 2048
+
+
+def _valid_primary_form_url(result: Dict[str, Any]) -> Optional[str]:
+    """先頭の form_url を検証し、有効なら前後空白を除いた文字列を返す（無効なら None）"""
+    form_urls = result.get('form_urls', [])
+    form_url = form_urls[0] if form_urls else None
+    if not form_url:
+        return None
+    form_url_str = str(form_url).strip()
+    if is_valid_form_url(form_url_str) and len(form_url_str) <= MAX_FORM_URL_LENGTH:
+        return form_url_str
+    return None
+
 
 class SupabaseFormFinderWriter:
     """Supabase書き込み管理クラス（Form Finder用）"""
@@ -67,7 +84,9 @@ class SupabaseFormFinderWriter:
         """
         try:
             # 成功判定を厳格化: form_urlsが空または無効な場合は失敗として扱う
+            # （URL検証はここで1回だけ行い、結果を一括更新にそのまま渡す）
             truly_successful_results = []
+            valid_form_urls: Dict[Any, str] = {}
             failed_results = []
             
             for result in results_data:
@@ -81,19 +100,12 @@ class SupabaseFormFinderWriter:
                 
                 # statusが'success'でもform_urlsが有効でない場合は失敗扱い
                 if result.get('status') == 'success':
-                    form_urls = result.get('form_urls', [])
-                    form_url = form_urls[0] if form_urls else None
-                    
                     # URL妥当性をチェック
-                    has_valid_url = False
-                    if form_url:
-                        from .utils import is_valid_form_url
-                        form_url_str = str(form_url).strip()
-                        if is_valid_form_url(form_url_str) and len(form_url_str) <= 2048:
-                            has_valid_url = True
+                    form_url_str = _valid_primary_form_url(result)
                     
-                    if has_valid_url:
+                    if form_url_str is not None:
                         truly_successful_results.append(result)
+                        valid_form_urls[result.get('record_id')] = form_url_str
                         logger.debug(f"record_id={result.get('record_id')}: 真の成功として分類")
                     else:
                         # form_urlが無効なので失敗として再分類
@@ -112,7 +124,7 @@ class SupabaseFormFinderWriter:
             
             # 成功結果の一括更新
             if successful_results:
-                success_updated = self._batch_update_success_results(successful_results)
+                success_updated = self._batch_update_success_results(successful_results, valid_form_urls)
                 
             # 失敗結果の一括更新  
             if failed_results:
@@ -127,8 +139,15 @@ class SupabaseFormFinderWriter:
             logger.error(f"Form Finder結果保存エラー: {e}")
             return False
     
-    def _batch_update_success_results(self, successful_results: List[Dict[str, Any]]) -> int:
-        """成功結果の効率的なバッチ更新（整合性強化版）"""
+    def _batch_update_success_results(
+        self,
+        successful_results: List[Dict[str, Any]],
+        valid_form_urls: Optional[Dict[Any, str]] = None,
+    ) -> int:
+        """成功結果の効率的なバッチ更新（整合性強化版）
+
+        valid_form_urls（record_id -> 検証済み form_url）が渡された場合は URL の再検証を省略する
+        """
         try:
             # companies以外（例: companies_extra）はRPC未対応のためフォールバックを使用
             if self.target_table != 'companies':
@@ -145,28 +164,24 @@ class SupabaseFormFinderWriter:
                     logger.warning(f"不正なrecord_id: {record_id}")
                     continue
                 
-                # フォームURLの安全な処理
-                form_urls = result.get('form_urls', [])
-                form_url = form_urls[0] if form_urls else None
+                # フォームURLの安全な処理（検証済みURLがあれば再検証しない）
+                if valid_form_urls is not None:
+                    form_url_str = valid_form_urls.get(record_id)
+                else:
+                    form_url_str = _valid_primary_form_url(result)
                 
-                # 整合性チェック: 有効なform_urlが存在するかを厳密に検証
                 has_valid_form_url = False
-                if form_url:
-                    form_url_str = str(form_url).strip()
-                    
-                    # 統一化されたURL妥当性検証
-                    from .utils import is_valid_form_url
-                    if is_valid_form_url(form_url_str):
-                        # SQLインジェクション対策: 単一引用符をエスケープ
-                        form_url_sanitized = form_url_str.replace("'", "''")
-                        # 長さ制限（URLとして妥当な範囲）
-                        if len(form_url_sanitized) <= 2048:
-                            form_url_mapping[record_id] = form_url_sanitized
-                            has_valid_form_url = True
-                        else:
-                            logger.warning(f"form_urlが長すぎます (record_id={record_id}): {len(form_url_sanitized)}文字")
+                if form_url_str is not None:
+                    # SQLインジェクション対策: 単一引用符をエスケープ
+                    form_url_sanitized = form_url_str.replace("'", "''")
+                    # 長さ制限（URLとして妥当な範囲）
+                    if len(form_url_sanitized) <= MAX_FORM_URL_LENGTH:
+                        form_url_mapping[record_id] = form_url_sanitized
+                        has_valid_form_url = True
                     else:
-                        logger.warning(f"無効なform_urlを検出 (record_id={record_id}): {form_url_str}")
+                        logger.warning(f"form_urlが長すぎます (record_id={record_id}): {len(form_url_sanitized)}文字")
+                else:
+                    logger.warning(f"無効なform_urlを検出 (record_id={record_id})")
                 
                 # 整合性保証: 有効なform_urlが存在する場合のみ成功として処理
                 if has_valid_form_url:
@@ -27,6 +27,9 @@ from form_sender.security.log_sanitizer import setup_sanitized_logging
 from form_finder.orchestrator.manager import ConfigurableFormFinderOrchestrator
 from utils.env import get_runtime_environment, is_ci_environment
 
+# forkserver で事前ロードするモジュール（ワーカー起動時の import コストの大半を占める）
+WORKER_PRELOAD_MODULES = ['form_finder.worker.isolated_worker']
+
 # ロギング設定
 logging.basicConfig(
     level=logging.INFO,
@@ -135,8 +138,14 @@ async def main():
     
     # マルチプロセス環境設定（既存設定を確認してから適用）
     if mp.get_start_method(allow_none=True) is None:
-        mp.set_start_method('spawn')  # クロスプラットフォーム互換性
-        logger.info("Set multiprocessing start method to 'spawn'")
+        if 'forkserver' in mp.get_all_start_methods():
+            # forkserver にワーカーモジュール（Playwright等の依存を含む）を事前ロードし、
+            # 各ワーカーは import 済みの状態から fork して起動時間・メモリを抑える
+            mp.set_start_method('forkserver')
+            mp.set_forkserver_preload(WORKER_PRELOAD_MODULES)
+        else:
+            mp.set_start_method('spawn')  # クロスプラットフォーム互換性
+        logger.info(f"Set multiprocessing start method to '{mp.get_start_method()}'")
     else:
         current_method = mp.get_start_method()
         logger.info(f"Using existing multiprocessing method: {current_method}")
@@ -194,16 +203,19 @@ async def main():
         
         # 最終サマリー
         final_summary = orchestrator.get_processing_summary()
-        logger.info(f"=== Form Finder Multi-Process Processing Completed ===")
-        logger.info(f"Total Companies Processed: {final_summary['processed_count']}")
-        logger.info(f"Technical Success: {final_summary['success_count']}")
-        logger.info(f"Technical Failed: {final_summary['failed_count']}")
-        logger.info(f"Business Success (Forms Found): {final_summary['business_successful_count']}")
-        logger.info(f"Business Failed (No Forms): {final_summary['business_failed_count']}")
-        logger.info(f"Total Forms Found: {final_summary['total_forms_found']}")
-        logger.info(f"Form Discovery Rate: {final_summary['form_discovery_rate']}%")
-        logger.info(f"Total Execution Time: {final_summary['elapsed_time']:.2f} seconds")
-        logger.info(f"Workers Used: {final_summary['num_workers']}")
+        # 複数行を1レコードにまとめて出力（ハンドラのロック取得・書き込みを1回に）
+        logger.info("\n".join([
+            "=== Form Finder Multi-Process Processing Completed ===",
+            f"Total Companies Processed: {final_summary['processed_count']}",
+            f"Technical Success: {final_summary['success_count']}",
+            f"Technical Failed: {final_summary['failed_count']}",
+            f"Business Success (Forms Found): {final_summary['business_successful_count']}",
+            f"Business Failed (No Forms): {final_summary['business_failed_count']}",
+            f"Total Forms Found: {final_summary['total_forms_found']}",
+            f"Form Discovery Rate: {final_summary['form_discovery_rate']}%",
+            f"Total Execution Time: {final_summary['elapsed_time']:.2f} seconds",
+            f"Workers Used: {final_summary['num_workers']}",
+        ]))
         
         # 結果保存
         orchestrator.save_results()
@@ -1,3 +1,4 @@
+import heapq
 import logging
 from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
 from playwright.async_api import Page, Locator
@@ -866,13 +867,13 @@ class FieldMapper:
             except Exception:
                 continue
 
-        quick_scored.sort(key=lambda x: x[0], reverse=True)
         top_k = (
             self.settings["quick_top_k_essential"]
             if field_name in self.settings["essential_fields"]
             else self.settings["quick_top_k"]
         )
-        return [el for _, el in quick_scored[:top_k]]
+        # 上位 top_k 件のみ必要なため全件ソートは行わない（同点時の順序は安定ソートと同じ）
+        return [el for _, el in heapq.nlargest(top_k, quick_scored, key=lambda x: x[0])]
 
     async def _score_element_in_detail(self, element, field_patterns, field_name):
         element_bounds = self._element_bounds_cache.get(str(element))
@@ -1314,8 +1315,7 @@ class FieldMapper:
         if not candidates:
             return
 
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        score, el, details, contexts = candidates[0]
+        score, el, details, contexts = max(candidates, key=lambda x: x[0])
         # 設定化した安全側の閾値（旧式サイト対応でやや緩和）
         if score >= int(self.settings.get("email_fallback_min_score", 55)):
             info = await self._create_enhanced_element_info(el, details, contexts)
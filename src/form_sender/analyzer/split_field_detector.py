@@ -6,6 +6,7 @@
 """
 
 import logging
+from collections import Counter
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -1465,17 +1466,12 @@ class SplitFieldDetector:
     
     def get_detector_summary(self, split_groups: List[SplitFieldGroup]) -> Dict[str, Any]:
         """検出器のサマリーを取得"""
-        pattern_counts = {}
-        total_confidence = 0.0
-        
-        for group in split_groups:
-            pattern_name = group.pattern.value
-            pattern_counts[pattern_name] = pattern_counts.get(pattern_name, 0) + 1
-            total_confidence += group.confidence
+        pattern_counts = Counter(group.pattern.value for group in split_groups)
+        total_confidence = sum(group.confidence for group in split_groups)
         
         return {
             'total_groups': len(split_groups),
-            'patterns': pattern_counts,
+            'patterns': dict(pattern_counts),
             'avg_confidence': total_confidence / len(split_groups) if split_groups else 0.0,
             'valid_sequences': sum(1 for g in split_groups if g.sequence_valid)
         }
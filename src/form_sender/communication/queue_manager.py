@@ -9,12 +9,16 @@ import multiprocessing as mp
 import queue
 import time
 import uuid
+from collections import deque
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# 完了結果の保持件数（統計は件数のみ参照するため、直近分だけを保持してメモリ増加を抑える）
+COMPLETED_HISTORY_SIZE = 200
+
 
 class QueueManagerError(Exception):
     """キューマネージャーの基本例外クラス"""
@@ -48,7 +52,7 @@ class ResultStatus(Enum):
     WORKER_SHUTDOWN = "worker_shutdown"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkerTask:
     """ワーカータスクのデータ構造"""
     task_id: str
@@ -74,7 +78,7 @@ class WorkerTask:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkerResult:
     """ワーカー結果のデータ構造"""
     task_id: str
@@ -90,7 +94,8 @@ class WorkerResult:
     
     def to_dict(self) -> Dict[str, Any]:
         """辞書形式に変換"""
-        result = asdict(self)
+        # 結果は送信直後に破棄されるため asdict の再帰コピーは行わず浅く詰め替える
+        result = {name: getattr(self, name) for name in self.__slots__}
         # Enumを文字列に変換
         result['status'] = self.status.value
         return result
@@ -121,19 +126,20 @@ class QueueManager:
         
         # タスク管理
         self.pending_tasks = {}  # task_id -> WorkerTask
-        self.completed_tasks = {}  # task_id -> WorkerResult
+        self.completed_tasks = deque(maxlen=COMPLETED_HISTORY_SIZE)  # 直近の WorkerResult
         self.task_counter = 0
         
         # ワーカー状態管理
         self.worker_status = {}  # worker_id -> status
-        self.worker_last_heartbeat = {}  # worker_id -> timestamp
+        self.worker_last_heartbeat = {}  # worker_id -> timestamp（time.monotonic）
         
-        # 統計情報
+        # 統計情報（start_time を含む時刻はすべて経過時間計算専用の time.monotonic）
         self.stats = {
             'tasks_sent': 0,
             'results_received': 0,
+            'tasks_completed': 0,
             'errors': 0,
-            'start_time': time.time()
+            'start_time': time.monotonic()
         }
         
         logger.info(f"QueueManager initialized with {num_workers} workers")
@@ -218,7 +224,7 @@ class QueueManager:
             # ワーカー状態更新
             if result.status == ResultStatus.WORKER_READY:
                 self.worker_status[result.worker_id] = 'ready'
-                self.worker_last_heartbeat[result.worker_id] = time.time()
+                self.worker_last_heartbeat[result.worker_id] = time.monotonic()
                 logger.debug(f"Worker {result.worker_id} is ready")
                 
             elif result.status == ResultStatus.WORKER_SHUTDOWN:
@@ -229,7 +235,8 @@ class QueueManager:
                 # 処理結果の場合
                 task_id = result.task_id
                 if task_id in self.pending_tasks:
-                    self.completed_tasks[task_id] = result
+                    self.completed_tasks.append(result)
+                    self.stats['tasks_completed'] += 1
                     del self.pending_tasks[task_id]
                     
                     if result.status == ResultStatus.ERROR:
@@ -249,6 +256,18 @@ class QueueManager:
                 f"Failed to retrieve worker result from queue: {e}"
             )
     
+    def has_results(self) -> bool:
+        """
+        結果キューに取得可能な結果があるかを軽量に判定（取得・例外送出を伴わない）
+        
+        Returns:
+            bool: 結果がありそうな場合True（判定できない場合も取得を試みるためTrue）
+        """
+        try:
+            return not self.result_queue.empty()
+        except Exception:
+            return True
+    
     def get_all_available_results(self) -> List[WorkerResult]:
         """
         利用可能な全ての結果を取得（ノンブロッキング）
@@ -266,6 +285,24 @@ class QueueManager:
         
         return results
     
+    def get_results_blocking(self, timeout: float) -> List[WorkerResult]:
+        """
+        結果が届くまで最大 timeout 秒待機し、届いた時点で利用可能な結果をすべて取得
+        
+        Args:
+            timeout: 最初の1件を待つ最大秒数
+            
+        Returns:
+            List[WorkerResult]: 結果リスト（タイムアウト時は空）
+        """
+        first = self.get_result(timeout=timeout)
+        if first is None:
+            return []
+        
+        results = [first]
+        results.extend(self.get_all_available_results())
+        return results
+    
     def send_shutdown_signal(self):
         """全ワーカーに終了シグナルを送信"""
         logger.info("Sending shutdown signal to all workers")
@@ -294,9 +331,9 @@ class QueueManager:
         """
         logger.info(f"Waiting for {self.num_workers} workers to shutdown...")
         shutdown_count = 0
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while shutdown_count < self.num_workers and (time.time() - start_time) < timeout:
+        while shutdown_count < self.num_workers and (time.monotonic() - start_time) < timeout:
             result = self.get_result(timeout=1)
             if result and result.status == ResultStatus.WORKER_SHUTDOWN:
                 shutdown_count += 1
@@ -319,7 +356,7 @@ class QueueManager:
         Returns:
             Dict[int, str]: worker_id -> status のマップ
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         health_status = {}
         
         # キューサイズ取得（バックプレッシャー検知用）
@@ -335,8 +372,9 @@ class QueueManager:
         medium_backpressure_threshold = 70  # 50 -> 70
         
         for worker_id, status in self.worker_status.items():
-            last_heartbeat = self.worker_last_heartbeat.get(worker_id, 0)
-            heartbeat_age = current_time - last_heartbeat
+            last_heartbeat = self.worker_last_heartbeat.get(worker_id)
+            # ハートビート未受信は応答なし扱い（monotonic は起点が不定のため 0 を既定値にしない）
+            heartbeat_age = current_time - last_heartbeat if last_heartbeat is not None else float('inf')
             
             if status == 'shutdown':
                 health_status[worker_id] = 'shutdown'
@@ -366,7 +404,7 @@ class QueueManager:
     
     def get_stats(self) -> Dict[str, Any]:
         """統計情報を取得"""
-        elapsed_time = time.time() - self.stats['start_time']
+        elapsed_time = time.monotonic() - self.stats['start_time']
         
         return {
             'elapsed_time': elapsed_time,
@@ -374,7 +412,7 @@ class QueueManager:
             'results_received': self.stats['results_received'],
             'errors': self.stats['errors'],
             'pending_tasks': len(self.pending_tasks),
-            'completed_tasks': len(self.completed_tasks),
+            'completed_tasks': self.stats['tasks_completed'],
             'worker_count': self.num_workers,
             'queue_sizes': {
                 'task_queue': self.task_queue.qsize() if hasattr(self.task_queue, 'qsize') else 'unknown',
@@ -392,7 +430,7 @@ class QueueManager:
         Returns:
             List[str]: 回復されたタスクIDのリスト
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         recovered_tasks = []
         
         # 長時間pending状態のタスクを特定
@@ -437,7 +475,7 @@ class QueueManager:
         Returns:
             Dict[str, Any]: pending タスクの統計情報
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # 年齢別分布
         age_distribution = {'<1min': 0, '1-5min': 0, '5-10min': 0, '>10min': 0}
@@ -8,6 +8,7 @@ from .validator import (
     clear_config_cache,
     get_validator,
     transform_client_config,
+    transform_many,
 )
 
 __all__ = [
@@ -18,4 +19,5 @@ __all__ = [
     "clear_config_cache",
     "get_validator",
     "transform_client_config",
+    "transform_many",
 ]
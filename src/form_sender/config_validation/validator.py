@@ -10,8 +10,9 @@ import hashlib
 import json
 import logging
 import re
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple, TypedDict, Union
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, TypedDict, Union
 
 logger = logging.getLogger(__name__)
 
@@ -20,22 +21,27 @@ class ClientConfigValidationError(ValueError):
     """client_config の検証に失敗した場合の例外。"""
 
 
-class TargetingConfig(TypedDict, total=False):
-    """GAS 側 targeting セクションの型定義。"""
+class _TargetingRequired(TypedDict):
+    """targeting セクションの必須フィールド。"""
 
-    id: int
     subject: str
     message: str
-    targeting_sql: str
-    ng_companies: str
     max_daily_sends: int
     send_start_time: str
     send_end_time: str
     send_days_of_week: List[int]
 
 
-class ClientInfo(TypedDict, total=False):
-    """GAS 側 client セクションの型定義。"""
+class TargetingConfig(_TargetingRequired, total=False):
+    """GAS 側 targeting セクションの型定義。"""
+
+    id: int
+    targeting_sql: str
+    ng_companies: str
+
+
+class _ClientInfoRequired(TypedDict):
+    """client セクションの必須フィールド（空文字不可）。"""
 
     company_name: str
     company_name_kana: str
@@ -49,14 +55,19 @@ class ClientInfo(TypedDict, total=False):
     position: str
     gender: str
     email_1: str
-    email_2: str
     postal_code_1: str
-    postal_code_2: str
     address_1: str
     address_2: str
     address_3: str
-    address_4: str
     phone_1: str
+
+
+class ClientInfo(_ClientInfoRequired, total=False):
+    """GAS 側 client セクションの型定義。"""
+
+    email_2: str
+    postal_code_2: str
+    address_4: str
     phone_2: str
     phone_3: str
     department: str
@@ -74,21 +85,91 @@ class Gas2SheetConfig(TypedDict):
     targeting: TargetingConfig
 
 
-_ConfigCache = Dict[str, Tuple[Dict[str, Any], float]]
-_config_cache: _ConfigCache = {}
+def _keys_in_order(schema: Any, keys: frozenset) -> Tuple[str, ...]:
+    return tuple(k for k in schema.__annotations__ if k in keys)
+
+
+# 必須/任意フィールドは TypedDict 定義を唯一の情報源とし、import 時に一度だけ算出する
+_CLIENT_REQUIRED_FIELDS = _keys_in_order(ClientInfo, ClientInfo.__required_keys__)
+# department / website_url / address_5 は従来どおり空欄検査・キャッシュキーの対象外とする
+_CLIENT_UNCHECKED_FIELDS = frozenset({'department', 'website_url', 'address_5'})
+_CLIENT_OPTIONAL_FIELDS = _keys_in_order(
+    ClientInfo, ClientInfo.__optional_keys__ - _CLIENT_UNCHECKED_FIELDS
+)
+_TARGETING_REQUIRED_FIELDS = _keys_in_order(TargetingConfig, TargetingConfig.__required_keys__)
+
+_ConfigCache = Dict[Hashable, Tuple[Dict[str, Any], float]]
+# dispatcher のスレッドプールから並行に呼ばれるため、キャッシュはスレッドごとに保持する
+_tls = threading.local()
 _CACHE_TTL_SECONDS = 300
 
+_BOOL_MAP = {
+    'true': True, '1': True, 'yes': True, 'on': True,
+    'false': False, '0': False, 'no': False, 'off': False, '': False,
+}
+_VALID_DAYS_OF_WEEK = frozenset(range(7))
+_TIME_PATTERN = re.compile(r'^([01]\d|2[0-3]):([0-5]\d)$')
+
+
+def _cache() -> _ConfigCache:
+    cache = getattr(_tls, "cache", None)
+    if cache is None:
+        cache = {}
+        _tls.cache = cache
+    return cache
+
+
+_MISSING = object()
+
 
-def _get_cache_key(raw_config: Dict[str, Any]) -> str:
+def _typed(value: Any) -> Tuple[Any, ...]:
+    # 1 / 1.0 / True は等値・同ハッシュだが検証結果が異なるため、型もキーに含める
+    if type(value) is list:
+        return (list, tuple((type(v), v) for v in value))
+    return (type(value), value)
+
+
+def _get_cache_key(raw_config: Dict[str, Any]) -> Hashable:
+    """検証が参照するフィールドだけからキャッシュキーを作る。
+
+    検証結果はこの部分集合だけで決まるため、設定全体の JSON 直列化は行わない。
+    ハッシュ不能な値を含む場合のみ、従来どおり全体の JSON ダイジェストを使う。
+    """
+    client = raw_config.get('client')
+    targeting = raw_config.get('targeting')
+    if type(client) is dict and type(targeting) is dict:
+        key = (
+            _typed(raw_config.get('targeting_id', _MISSING)),
+            _typed(raw_config.get('client_id', _MISSING)),
+            raw_config.get('active'),
+            tuple(_typed(client.get(f, _MISSING)) for f in _CLIENT_REQUIRED_FIELDS),
+            tuple(_typed(client.get(f, _MISSING)) for f in _CLIENT_OPTIONAL_FIELDS),
+            tuple(_typed(targeting.get(f)) for f in _TARGETING_REQUIRED_FIELDS),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            pass
+        else:
+            return key
     try:
         config_str = json.dumps(raw_config, sort_keys=True)
     except TypeError as exc:
         raise ClientConfigValidationError(f"config is not JSON serializable: {exc}") from exc
-    return hashlib.sha256(config_str.encode()).hexdigest()
+    return hashlib.blake2b(config_str.encode(), digest_size=16).hexdigest()
 
 
-def _is_cache_valid(timestamp: float) -> bool:
-    return (time.time() - timestamp) < _CACHE_TTL_SECONDS
+def _lookup_cached(
+    config: Dict[str, Any], cache_key: Hashable, config_cache: _ConfigCache, now: float
+) -> Optional[Dict[str, Any]]:
+    cached = config_cache.get(cache_key)
+    if not cached or (now - cached[1]) >= _CACHE_TTL_SECONDS:
+        return None
+    # キーは検証が参照する全フィールドを含むため、キーが一致すれば入力は検証済みとみなせる。
+    # 設定全体の比較は行わず、入力自身を返す
+    if cached[0] is not config:
+        config_cache[cache_key] = (config, cached[1])
+    return config
 
 
 def _ensure_dict(value: Any, name: str) -> Dict[str, Any]:
@@ -119,18 +200,9 @@ def _validate_2sheet_config(config: Dict[str, Any]) -> None:
     if 'client_id' not in config:
         raise ClientConfigValidationError("必須フィールド 'client_id' が見つかりません")
 
-    client_required_fields = [
-        'company_name', 'company_name_kana', 'form_sender_name',
-        'last_name', 'first_name', 'last_name_kana', 'first_name_kana',
-        'last_name_hiragana', 'first_name_hiragana', 'position',
-        'gender', 'email_1',
-        'postal_code_1', 'address_1', 'address_2', 'address_3',
-        'phone_1'
-    ]
-    client_optional_not_empty = ['postal_code_2', 'address_4', 'phone_2', 'phone_3', 'email_2']
     client = config['client']
     missing_client_fields = [
-        f for f in client_required_fields
+        f for f in _CLIENT_REQUIRED_FIELDS
         if f not in client or _is_blank(client.get(f))
     ]
     if missing_client_fields:
@@ -139,17 +211,14 @@ def _validate_2sheet_config(config: Dict[str, Any]) -> None:
         )
 
     optional_empty = [
-        f for f in client_optional_not_empty
+        f for f in _CLIENT_OPTIONAL_FIELDS
         if f in client and _is_blank(client.get(f))
     ]
     if optional_empty:
         logger.debug("client optional fields left blank: %s", optional_empty)
 
-    targeting_required_fields = [
-        'subject', 'message', 'max_daily_sends', 'send_start_time', 'send_end_time', 'send_days_of_week'
-    ]
     targeting = config['targeting']
-    missing_targeting_fields = [f for f in targeting_required_fields if targeting.get(f) is None]
+    missing_targeting_fields = [f for f in _TARGETING_REQUIRED_FIELDS if targeting.get(f) is None]
     if missing_targeting_fields:
         raise ClientConfigValidationError(
             f"targeting セクションの必須フィールドが不足: {missing_targeting_fields}"
@@ -164,33 +233,33 @@ def _validate_2sheet_config(config: Dict[str, Any]) -> None:
     if not isinstance(targeting['max_daily_sends'], int):
         raise ClientConfigValidationError("targeting.max_daily_sends は整数である必要があります")
 
-    if not all(isinstance(day, int) and 0 <= day <= 6 for day in targeting['send_days_of_week']):
+    if not all(isinstance(day, int) and day in _VALID_DAYS_OF_WEEK for day in targeting['send_days_of_week']):
         raise ClientConfigValidationError(
             "targeting.send_days_of_week は 0-6 の整数リストである必要があります"
         )
 
-    time_pattern = re.compile(r'^([01]\d|2[0-3]):([0-5]\d)$')
-    if not time_pattern.match(targeting['send_start_time']):
+    if not _TIME_PATTERN.match(targeting['send_start_time']):
         raise ClientConfigValidationError(
             "targeting.send_start_time は 'HH:MM' 形式である必要があります"
         )
-    if not time_pattern.match(targeting['send_end_time']):
+    if not _TIME_PATTERN.match(targeting['send_end_time']):
         raise ClientConfigValidationError(
             "targeting.send_end_time は 'HH:MM' 形式である必要があります"
         )
 
 
 def _normalize_boolean(value: Any) -> bool:
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
+    # 大半の入力は既に bool なので、同一性比較で先に返す
+    if value is True:
+        return True
+    if value is False:
+        return False
+    if type(value) is str:
+        parsed = _BOOL_MAP.get(value.strip().lower())
+        if parsed is not None:
+            return parsed
+    elif isinstance(value, (int, float)):
         return bool(value)
-    if isinstance(value, str):
-        lowered = value.strip().lower()
-        if lowered in {'true', '1', 'yes', 'on'}:
-            return True
-        if lowered in {'false', '0', 'no', 'off', ''}:
-            return False
     raise ClientConfigValidationError(f"ブール値として解釈できません: {value}")
 
 
@@ -204,32 +273,82 @@ def _get_config_value(config: Dict[str, Any], key: str, fallback_key: Optional[s
     return None
 
 
-def transform_client_config(raw_config: Union[Gas2SheetConfig, Dict[str, Any]]) -> Dict[str, Any]:
-    copy_config = dict(raw_config)
-    cache_key = _get_cache_key(copy_config)
-    cached = _config_cache.get(cache_key)
-    if cached and _is_cache_valid(cached[1]):
-        logger.debug("client_config cache hit: %s", cache_key[:8])
-        return cached[0]
-
-    _validate_2sheet_config(copy_config)
-    logger.info("client_config validation succeeded for targeting_id=%s", copy_config.get('targeting_id'))
-
-    # active フィールド統一（bool化）
-    active_value = copy_config.get('active', True)
+def _prepare_config(raw_config: Union[Gas2SheetConfig, Dict[str, Any]], copy: bool) -> Dict[str, Any]:
+    if copy or type(raw_config) is not dict:
+        config = dict(raw_config)
+    else:
+        config = raw_config
+    # active フィールド統一（bool化）。正規化後の値でキーを作り、同値な入力が同じキャッシュに当たるようにする
+    active_value = config.get('active', True)
     try:
-        copy_config['active'] = _normalize_boolean(active_value)
+        config['active'] = _normalize_boolean(active_value)
     except ClientConfigValidationError as exc:
         raise ClientConfigValidationError(f"active フィールドの値が不正です: {active_value}") from exc
+    return config
+
 
-    logger.debug("client_config normalization complete (active=%s)", copy_config['active'])
+def _validate_and_store(
+    config: Dict[str, Any], cache_key: Hashable, config_cache: _ConfigCache, now: float
+) -> Dict[str, Any]:
+    _validate_2sheet_config(config)
+    logger.info("client_config validation succeeded for targeting_id=%s", config.get('targeting_id'))
 
-    _config_cache[cache_key] = (copy_config, time.time())
-    return copy_config
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("client_config normalization complete (active=%s)", config['active'])
+
+    config_cache[cache_key] = (config, now)
+    return config
+
+
+def transform_client_config(
+    raw_config: Union[Gas2SheetConfig, Dict[str, Any]],
+    copy: bool = False,
+) -> Dict[str, Any]:
+    """client_config を検証し、active を bool 化した辞書を返す。
+
+    呼び出し元はいずれも raw_config を使い捨てるため、素の dict はコピーせずそのまま
+    正規化する（``active`` キーが書き換わる）。入力を保持したい場合は ``copy=True`` を指定する。
+    """
+    copy_config = _prepare_config(raw_config, copy)
+    cache_key = _get_cache_key(copy_config)
+    config_cache = _cache()
+    now = time.time()
+    cached = _lookup_cached(copy_config, cache_key, config_cache, now)
+    if cached is not None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("client_config cache hit (targeting_id=%s)", cached.get('targeting_id'))
+        return cached
+
+    return _validate_and_store(copy_config, cache_key, config_cache, now)
+
+
+def transform_many(
+    raw_configs: Sequence[Union[Gas2SheetConfig, Dict[str, Any]]],
+    copy: bool = False,
+) -> List[Dict[str, Any]]:
+    """複数の client_config をまとめて検証し、入力順に結果を返す。
+
+    dispatcher の一括投入向け。キャッシュ参照と時刻取得を1回にまとめ、
+    同一内容の設定はバッチ内でも一度だけ検証する。
+    """
+    prepared = [_prepare_config(raw_config, copy) for raw_config in raw_configs]
+    keys = [_get_cache_key(config) for config in prepared]
+
+    config_cache = _cache()
+    now = time.time()
+    results: List[Dict[str, Any]] = []
+    for config, cache_key in zip(prepared, keys):
+        cached = _lookup_cached(config, cache_key, config_cache, now)
+        if cached is not None:
+            results.append(cached)
+            continue
+        results.append(_validate_and_store(config, cache_key, config_cache, now))
+    return results
 
 
 def clear_config_cache() -> None:
-    _config_cache.clear()
+    """呼び出し元スレッドのキャッシュをクリアする。"""
+    _cache().clear()
 
 
 def get_validator() -> "ClientConfigValidator":
@@ -239,8 +358,19 @@ def get_validator() -> "ClientConfigValidator":
 class ClientConfigValidator:
     """オブジェクト指向のバリデータラッパー。"""
 
-    def transform(self, raw_config: Union[Gas2SheetConfig, Dict[str, Any]]) -> Dict[str, Any]:
-        return transform_client_config(raw_config)
+    def transform(
+        self,
+        raw_config: Union[Gas2SheetConfig, Dict[str, Any]],
+        copy: bool = False,
+    ) -> Dict[str, Any]:
+        return transform_client_config(raw_config, copy=copy)
+
+    def transform_many(
+        self,
+        raw_configs: Sequence[Union[Gas2SheetConfig, Dict[str, Any]]],
+        copy: bool = False,
+    ) -> List[Dict[str, Any]]:
+        return transform_many(raw_configs, copy=copy)
 
     def clear_cache(self) -> None:
         clear_config_cache()
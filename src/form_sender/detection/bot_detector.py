@@ -19,6 +19,70 @@ class BotDetectionThresholds:
     RECAPTCHA_PAGE_MAX_TEXT_LENGTH = 200  # reCAPTCHAページの最大テキスト長
 
 
+# 暗黙の文字列リテラル結合は Python パーサ差異で SyntaxError になり得るため
+# 三重引用符の単一リテラルで定義する
+_RECAPTCHA_PROBE_JS = """
+() => {
+  const g = document.querySelector('.g-recaptcha');
+  let visible = false;
+  if (g) {
+    const st = getComputedStyle(g);
+    visible = !!st && st.display !== 'none' && st.visibility !== 'hidden';
+  }
+  return {
+    anchor: document.querySelectorAll('iframe[src*="recaptcha/api2/anchor"]').length,
+    sitekey: document.querySelectorAll('.g-recaptcha[data-sitekey]').length,
+    visible: visible,
+    s: document.querySelectorAll('script[src*="recaptcha/api.js"]').length,
+    i: document.querySelectorAll('iframe[src*="recaptcha"]').length,
+    g: document.querySelectorAll('[name="g-recaptcha-response"]').length,
+    b: document.querySelectorAll('.grecaptcha-badge, .g-recaptcha').length,
+    has_grecaptcha: typeof window.grecaptcha !== 'undefined'
+  };
+}
+""".strip()
+
+
+# 閾値は定数のため import 時に JS へ埋め込み、呼び出し毎の引数受け渡しを不要にする
+_NORMAL_PAGE_PROBE_JS = (
+    """
+() => {
+  if (document.querySelector('form, input, textarea, select')) return true;
+  if (document.querySelector('nav, header, footer, .header, .footer, .navigation')) return true;
+  const body = document.body;
+  if (body && (body.innerText || '').trim().length > __MIN_TEXT__) return true;
+  const root = document.documentElement;
+  return !!root && root.outerHTML.length > __MIN_HTML__;
+}
+"""
+    .strip()
+    .replace("__MIN_TEXT__", str(BotDetectionThresholds.NORMAL_PAGE_MIN_TEXT_LENGTH))
+    .replace("__MIN_HTML__", str(BotDetectionThresholds.NORMAL_PAGE_MIN_HTML_LENGTH))
+)
+
+
+# Challenge 条件が全て揃った場合のみ通常ページ判定も同じ evaluate 内で行う（is_normal は未評価なら null）
+_CLOUDFLARE_PROBE_JS = (
+    """
+() => {
+  const isNormal = __NORMAL_PAGE_PROBE__;
+  const html = document.documentElement ? document.documentElement.outerHTML : '';
+  const title = document.title;
+  const cfElement = !!document.querySelector('.cf-browser-verification, #cf-wrapper');
+  const cfText = html.includes('Cloudflare') && html.includes('Checking your browser');
+  return {
+    title: title,
+    cf_element: cfElement,
+    cf_text: cfText,
+    is_normal: (title === 'Just a moment...' && cfElement && cfText) ? isNormal() : null
+  };
+}
+"""
+    .strip()
+    .replace("__NORMAL_PAGE_PROBE__", _NORMAL_PAGE_PROBE_JS)
+)
+
+
 class BotDetectionSystem:
     """Bot検知システム（偽陽性防止最優先版）"""
 
@@ -35,10 +99,7 @@ class BotDetectionSystem:
             if cloudflare_detected:
                 return True, cloudflare_type
 
-            # Step 2: 通常ページの特徴が強ければ非Botとみなす
-            if await BotDetectionSystem._is_normal_page(page):
-                return False, None
-
+            # Step 2: 通常ページ判定は Cloudflare 判定内で必要時のみ行う（結果に関わらず非Bot扱いのため再判定しない）
             return False, None
 
         except Exception as e:
@@ -46,70 +107,21 @@ class BotDetectionSystem:
             # エラー時は安全側（通常ページ）に倒す
             return False, None
 
-    @staticmethod
-    async def _is_normal_page(page: Page) -> bool:
-        """通常ページの特徴をチェック（除外条件）"""
-        try:
-            # フォーム要素の存在チェック
-            form_elements = await page.locator("form, input, textarea, select").count()
-            if form_elements > 0:
-                return True
-
-            # 通常のサイト構造要素
-            nav_elements = await page.locator(
-                "nav, header, footer, .header, .footer, .navigation"
-            ).count()
-            if nav_elements > 0:
-                return True
-
-            # パフォーマンス最適化: テキスト長を先にチェック
-            text_content = await page.locator("body").inner_text()
-            if (
-                len(text_content.strip())
-                > BotDetectionThresholds.NORMAL_PAGE_MIN_TEXT_LENGTH
-            ):
-                return True
-
-            # テキストが少ない場合のみHTMLコンテンツをチェック
-            page_content = await page.content()
-            if len(page_content) > BotDetectionThresholds.NORMAL_PAGE_MIN_HTML_LENGTH:
-                return True
-
-            return False
-
-        except Exception:
-            # エラー時は通常ページとして扱う（安全側）
-            return True
-
     @staticmethod
     async def _detect_strict_recaptcha(page: Page) -> Tuple[bool, Optional[str]]:
         """reCAPTCHA検出（厳格→スコアリング緩和の2段構え）"""
         try:
-            # 厳格: v2 visible（anchor iframe + .g-recaptcha 可視）- DOM往復削減のため evaluate に集約
+            # 厳格判定・緩和判定に必要な DOM 情報を1回の evaluate でまとめて取得（CDP往復を1回に削減）
             try:
-                # 暗黙の文字列リテラル結合は Python パーサ差異で SyntaxError になり得るため
-                # 三重引用符の単一リテラルに変更して互換性を確保
-                rec = await page.evaluate(
-                    (
-                        """
-                        () => ({
-                          anchor: document.querySelectorAll('iframe[src*="recaptcha/api2/anchor"]').length,
-                          sitekey: document.querySelectorAll('.g-recaptcha[data-sitekey]').length,
-                          visible: !!document.querySelector('.g-recaptcha') && (function(el){
-                            const s = getComputedStyle(el);
-                            return s && s.display !== 'none' && s.visibility !== 'hidden';
-                          })(document.querySelector('.g-recaptcha'))
-                        })
-                        """
-                    ).strip()
-                )
+                rec = await page.evaluate(_RECAPTCHA_PROBE_JS)
             except Exception:
-                rec = {"anchor": 0, "sitekey": 0, "visible": False}
+                rec = {}
 
             recaptcha_iframe = int(rec.get("anchor", 0) or 0)
             g_recaptcha_cnt = int(rec.get("sitekey", 0) or 0)
             visible_recaptcha = bool(rec.get("visible", False))
 
+            # 厳格: v2 visible（anchor iframe + .g-recaptcha 可視）
             if recaptcha_iframe > 0 and g_recaptcha_cnt > 0 and visible_recaptcha:
                 # v2可視が明確
                 return True, "reCAPTCHA"
@@ -117,39 +129,17 @@ class BotDetectionSystem:
             # 緩和: v2 invisible / v3 など。複合シグナルの合算で判定。
             signals = 0
             # script / iframe 存在
-            try:
-                counts = await page.evaluate(
-                    (
-                        """
-                        () => ({
-                          s: document.querySelectorAll('script[src*="recaptcha/api.js"]').length,
-                          i: document.querySelectorAll('iframe[src*="recaptcha"]').length,
-                          g: document.querySelectorAll('[name="g-recaptcha-response"]').length,
-                          b: document.querySelectorAll('.grecaptcha-badge, .g-recaptcha').length
-                        })
-                        """
-                    ).strip()
-                )
-                if int(counts.get("s", 0) or 0) > 0:
-                    signals += 1
-                if recaptcha_iframe > 0 or int(counts.get("i", 0) or 0) > 0:
-                    signals += 1
-                if int(counts.get("g", 0) or 0) > 0:
-                    signals += 1
-                if int(counts.get("b", 0) or 0) > 0:
-                    signals += 1
-            except Exception:
-                pass
-
+            if int(rec.get("s", 0) or 0) > 0:
+                signals += 1
+            if recaptcha_iframe > 0 or int(rec.get("i", 0) or 0) > 0:
+                signals += 1
+            if int(rec.get("g", 0) or 0) > 0:
+                signals += 1
+            if int(rec.get("b", 0) or 0) > 0:
+                signals += 1
             # window.grecaptcha があれば強いシグナル
-            try:
-                has_grecaptcha = await page.evaluate(
-                    "() => typeof window.grecaptcha !== 'undefined'"
-                )
-                if has_grecaptcha:
-                    signals += 1
-            except Exception:
-                pass
+            if rec.get("has_grecaptcha"):
+                signals += 1
 
             if signals >= 2:
                 return True, "reCAPTCHA"
@@ -163,36 +153,26 @@ class BotDetectionSystem:
     async def _detect_strict_cloudflare(page: Page) -> Tuple[bool, Optional[str]]:
         """厳格なCloudflare Challenge検出（複数条件をANDで組み合わせ）"""
         try:
-            current_url = page.url
-            page_title = await page.title()
-
-            # 条件1: Challenge URLの完全一致
-            if "/cdn-cgi/challenge-platform/" not in current_url:
+            # 条件1: Challenge URLの完全一致（ブラウザ往復不要のため最初に判定）
+            if "/cdn-cgi/challenge-platform/" not in page.url:
                 return False, None
 
-            # 条件2: タイトルの完全一致
-            if page_title != "Just a moment...":
+            # 条件2,3,4,5: タイトル・Cloudflare特有要素・特定テキスト・通常ページ判定を1回の evaluate で判定
+            # （page.content() による DOM 全体の転送を行わない）
+            probe = await page.evaluate(_CLOUDFLARE_PROBE_JS)
+            if probe.get("title") != "Just a moment...":
                 return False, None
-
-            # 条件3: Cloudflare特有の要素が存在
-            cf_elements = await page.locator(".cf-browser-verification, #cf-wrapper").count()
-            if cf_elements == 0:
+            if not probe.get("cf_element"):
                 return False, None
-
-            # 条件4: 通常ページの特徴をチェック（重複ロジック統合）
-            if await BotDetectionSystem._is_normal_page(page):
+            if not probe.get("cf_text"):
                 return False, None
 
-            # 条件5: 特定のCloudflareテキストが存在（必要な場合のみページコンテンツ取得）
-            page_content = await page.content()
-            required_texts = ["Cloudflare", "Checking your browser"]
-            for text in required_texts:
-                if text not in page_content:
-                    return False, None
+            # 条件4: 通常ページの特徴をチェック（probe 内で評価済み）
+            if probe.get("is_normal"):
+                return False, None
 
             # 全条件を満たした場合のみCloudflare Challenge検出
             return True, "Cloudflare Challenge"
 
         except Exception:
             return False, None
-
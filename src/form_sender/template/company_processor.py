@@ -7,11 +7,21 @@ targeting.message内の企業固有プレースホルダー（{representative}
 
 import logging
 import re
-from typing import Dict, Any, Set, List
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, Set, List
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _required_company_columns(message: str, subject: str) -> FrozenSet[str]:
+    """subject/message の組から企業カラム集合を求める（同一テンプレートは一度だけ解析）"""
+    required_columns = set()
+    required_columns.update(CompanyPlaceholderAnalyzer.extract_company_placeholders(message))
+    required_columns.update(CompanyPlaceholderAnalyzer.extract_company_placeholders(subject))
+    return frozenset(required_columns)
+
+
 class CompanyPlaceholderAnalyzer:
     """企業固有プレースホルダー解析クラス"""
     
@@ -74,9 +84,13 @@ class CompanyPlaceholderAnalyzer:
         targeting_subject = client_config.get('subject', '')
         
         # subjectとmessageの両方から企業固有プレースホルダーを抽出
-        required_columns = set()
-        required_columns.update(CompanyPlaceholderAnalyzer.extract_company_placeholders(targeting_message))
-        required_columns.update(CompanyPlaceholderAnalyzer.extract_company_placeholders(targeting_subject))
+        # 解析結果は文字列の組でキャッシュし、呼び出し元が変更できるよう毎回 set で返す
+        if isinstance(targeting_message, str) and isinstance(targeting_subject, str):
+            required_columns = set(_required_company_columns(targeting_message, targeting_subject))
+        else:
+            required_columns = set()
+            required_columns.update(CompanyPlaceholderAnalyzer.extract_company_placeholders(targeting_message))
+            required_columns.update(CompanyPlaceholderAnalyzer.extract_company_placeholders(targeting_subject))
         
         logger.info(f"Required company columns: {required_columns}")
         return required_columns
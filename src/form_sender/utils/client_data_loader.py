@@ -44,8 +44,7 @@ def load_client_data_simple(config_file: str, targeting_id: int) -> Dict[str, An
             raise ValueError("Unsafe path sequence in config file path")
         # シンボリックリンクは解決前の生パスで拒否（resolve() 前）
         try:
-            import os as _os
-            if cf_raw.is_symlink() or _os.path.islink(str(cf_raw)):
+            if cf_raw.is_symlink() or os.path.islink(str(cf_raw)):
                 raise ValueError("Symlink is not allowed for config file")
         except Exception:
             # 検証不能な場合は保守的に拒否
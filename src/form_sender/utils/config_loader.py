@@ -6,8 +6,8 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
 from datetime import timedelta
 
 
@@ -49,6 +49,16 @@ class GCMonitoring:
     """ガベージコレクション監視設定"""
     alert_threshold: int
     monitoring_period: int
+    # 若い世代の回収で解放されたRSSがこの値（MB）未満なら全世代回収へ拡大する
+    escalation_min_freed_mb: float = 0.0
+    # gc.set_threshold に渡す世代別閾値（未指定ならインタプリタ既定のまま）
+    collection_thresholds: Optional[List[int]] = None
+
+
+@dataclass
+class Diagnostics:
+    """診断情報収集設定（高コストな計測はデバッグ時のみ有効化）"""
+    debug_diagnostics: bool = False
 
 
 @dataclass
@@ -137,6 +147,7 @@ class PerformanceMonitoringConfig:
     buffer_management: BufferManagement
     process_management: ProcessManagement
     worker_resilience: WorkerResilienceSettings
+    diagnostics: Diagnostics = field(default_factory=Diagnostics)
 
 
 class ConfigLoader:
@@ -182,6 +193,7 @@ class ConfigLoader:
             load_level_thresholds = LoadLevelThresholds(**config_data["load_level_thresholds"])
             gc_monitoring = GCMonitoring(**config_data["gc_monitoring"])
             history_management = HistoryManagement(**config_data["history_management"])
+            diagnostics = Diagnostics(**config_data.get("diagnostics", {}))
             
             # 複雑なネスト構造の処理
             backpressure_levels = BackpressureLevels(**config_data["buffer_management"]["backpressure_levels"])
@@ -215,7 +227,8 @@ class ConfigLoader:
                 history_management=history_management,
                 buffer_management=buffer_management,
                 process_management=process_management,
-                worker_resilience=worker_resilience
+                worker_resilience=worker_resilience,
+                diagnostics=diagnostics
             )
             
         except KeyError as e:
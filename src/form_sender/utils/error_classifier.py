@@ -453,6 +453,38 @@ class ErrorClassifier:
         # RuleBasedAnalyzerリアルタイム解析ではDBのinstruction_validフラグを更新しない
         return False
     
+    # 復旧可能なエラータイプ（従来＋新規）
+    _RECOVERABLE_TYPES = frozenset([
+        'TIMEOUT', 'ACCESS', 'ELEMENT_EXTERNAL', 
+        'INPUT_EXTERNAL', 'SYSTEM',
+        'ELEMENT_NOT_FOUND',            # サイト変更の可能性
+        'CONTENT_ANALYSIS_FAILED',     # 一時的な問題の可能性
+        'SUBMIT_BUTTON_NOT_FOUND',     # ページ変更の可能性
+        # 追加: ネットワーク/WAF/HTTP系
+        'DNS_ERROR', 'TLS_ERROR', 'CONNECTION_RESET', 'RATE_LIMIT', 'SERVER_ERROR',
+    ])
+    
+    # 復旧不可能なエラータイプ（構造的問題）
+    _NON_RECOVERABLE_TYPES = frozenset([
+        'INSTRUCTION', 'SUBMIT_BUTTON_SELECTOR_MISSING',
+        'SUCCESS_DETERMINATION_FAILED', 'INPUT_TYPE_MISMATCH',
+        'FORM_VALIDATION_ERROR', 'BOT_DETECTED',
+        # 追加: マッピング/検証起因は自動復旧不可
+        'MAPPING', 'VALIDATION_FORMAT', 'CSRF_ERROR', 'DUPLICATE_SUBMISSION',
+        # WAF系はクールダウンや人的対応を推奨（自動復旧対象外）
+        'WAF_CHALLENGE'
+    ])
+    
+    # 復旧不可能なエラーメッセージパターン（大文字小文字を無視した部分一致）
+    _NON_RECOVERABLE_MESSAGE_RE = re.compile(
+        '|'.join(map(re.escape, [
+            'instruction_valid', 'placeholder', 'json decode',
+            'invalid selector', 'malformed', 'selector missing',
+            'not provided', 'type mismatch', 'validation error'
+        ])),
+        re.IGNORECASE,
+    )
+    
     @classmethod
     def is_recoverable_error(cls, error_type: str, error_message: str) -> bool:
         """
@@ -465,42 +497,15 @@ class ErrorClassifier:
         Returns:
             bool: 復旧可能な場合 True
         """
-        # 復旧可能なエラータイプ（従来＋新規）
-        recoverable_types = [
-            'TIMEOUT', 'ACCESS', 'ELEMENT_EXTERNAL', 
-            'INPUT_EXTERNAL', 'SYSTEM',
-            'ELEMENT_NOT_FOUND',            # サイト変更の可能性
-            'CONTENT_ANALYSIS_FAILED',     # 一時的な問題の可能性
-            'SUBMIT_BUTTON_NOT_FOUND',     # ページ変更の可能性
-            # 追加: ネットワーク/WAF/HTTP系
-            'DNS_ERROR', 'TLS_ERROR', 'CONNECTION_RESET', 'RATE_LIMIT', 'SERVER_ERROR',
-        ]
-        
-        # 復旧不可能なエラータイプ（構造的問題）
-        non_recoverable_types = [
-            'INSTRUCTION', 'SUBMIT_BUTTON_SELECTOR_MISSING',
-            'SUCCESS_DETERMINATION_FAILED', 'INPUT_TYPE_MISMATCH',
-            'FORM_VALIDATION_ERROR', 'BOT_DETECTED',
-            # 追加: マッピング/検証起因は自動復旧不可
-            'MAPPING', 'VALIDATION_FORMAT', 'CSRF_ERROR', 'DUPLICATE_SUBMISSION',
-            # WAF系はクールダウンや人的対応を推奨（自動復旧対象外）
-            'WAF_CHALLENGE'
-        ]
-        
-        if error_type in non_recoverable_types:
+        # 型による判定（集合はクラス属性として一度だけ構築）
+        if error_type in cls._NON_RECOVERABLE_TYPES:
             return False
         
-        if error_type not in recoverable_types:
+        if error_type not in cls._RECOVERABLE_TYPES:
             return False
         
-        # 特定のエラーメッセージパターンは復旧不可能
-        non_recoverable_patterns = [
-            'instruction_valid', 'placeholder', 'json decode',
-            'invalid selector', 'malformed', 'selector missing',
-            'not provided', 'type mismatch', 'validation error'
-        ]
-        
-        if any(pattern in error_message.lower() for pattern in non_recoverable_patterns):
+        # 特定のエラーメッセージパターンは復旧不可能（単一の正規表現で1パス判定）
+        if error_message and cls._NON_RECOVERABLE_MESSAGE_RE.search(error_message):
             return False
         
         return True
@@ -17,6 +17,9 @@ import json
 
 from .config_loader import get_performance_monitoring_config, PerformanceMonitoringConfig
 
+# タイムスタンプ用の JST（計測毎に timezone/timedelta を生成しない）
+JST = timezone(timedelta(hours=9))
+
 @dataclass
 class PerformanceMetrics:
     """パフォーマンス指標を格納するデータクラス"""
@@ -40,6 +43,9 @@ class PerformanceMetrics:
 class PerformanceMonitor:
     """包括的パフォーマンス監視システム"""
     
+    # gc.get_objects() は追跡中の全オブジェクトのリストを生成するため、この間隔（秒）でのみ再計測する
+    GC_OBJECTS_SAMPLE_INTERVAL = 300.0
+    
     def __init__(self, 
                  config: Optional[PerformanceMonitoringConfig] = None,
                  warning_memory_mb: Optional[float] = None,  # 下位互換性のため残存
@@ -79,7 +85,7 @@ class PerformanceMonitor:
         
         # 負荷レベル履歴（設定から最大サイズを取得）
         self.load_level_history = deque(maxlen=config.history_management.load_level_history_size)
-        self.last_interval_adjustment = datetime.now(timezone(timedelta(hours=9)))
+        self.last_interval_adjustment = datetime.now(JST)
         
         # 負荷レベル閾値（configから取得）
         self.load_thresholds = config.load_level_thresholds
@@ -89,6 +95,9 @@ class PerformanceMonitor:
         self.monitor_task: Optional[asyncio.Task] = None
         self.process = psutil.Process()
         
+        # 高コストな診断情報（ソケット列挙など）はデバッグ時のみ収集
+        self.debug_diagnostics = config.diagnostics.debug_diagnostics
+        
         # メトリクス履歴（設定から最大サイズを取得）
         self.max_history_size = config.history_management.max_metrics_history
         # dequeによる効率的な履歴管理（メモリリーク防止）
@@ -105,7 +114,14 @@ class PerformanceMonitor:
         
         # GC統計の追跡（設定から閾値を取得）
         self.last_gc_count = [0, 0, 0]  # gen0, gen1, gen2
+        self._gc_objects_cache: Optional[tuple] = None  # (計測時刻 monotonic, オブジェクト数)
         self.gc_alert_threshold = config.gc_monitoring.alert_threshold
+        self.gc_escalation_min_freed_mb = config.gc_monitoring.escalation_min_freed_mb
+        
+        # 世代別GC閾値の調整（プロセス全体の設定。既に同じ値なら何もしない）
+        thresholds = config.gc_monitoring.collection_thresholds
+        if thresholds and gc.get_threshold() != tuple(thresholds):
+            gc.set_threshold(*thresholds)
         
         # パフォーマンス統計
         self.stats = {
@@ -126,46 +142,53 @@ class PerformanceMonitor:
     def get_current_metrics(self) -> PerformanceMetrics:
         """現在のパフォーマンス指標を取得"""
         try:
-            # メモリ使用量
-            memory_info = self.process.memory_info()
-            memory_mb = memory_info.rss / 1024 / 1024
-            memory_percent = self.process.memory_percent()
-            
-            # CPU使用率
-            cpu_percent = self.process.cpu_percent()
-            
-            # プロセス時間
-            process_time = sum(self.process.cpu_times())
-            
-            # ガベージコレクション情報
-            gc_objects = len(gc.get_objects())
+            process = self.process
+            # 同一 tick 内の /proc/<pid>/stat・status 等の読み込みを oneshot で1回にまとめる
+            with process.oneshot():
+                # メモリ使用量
+                memory_info = process.memory_info()
+                memory_mb = memory_info.rss / 1024 / 1024
+                memory_percent = process.memory_percent()
+
+                # CPU使用率
+                cpu_percent = process.cpu_percent()
+
+                # プロセス時間
+                process_time = sum(process.cpu_times())
+
+                # 追加のシステム情報
+                file_descriptors = None
+                network_connections = None
+                context_switches = None
+
+                try:
+                    # Unix系システムでのみ利用可能
+                    file_descriptors = process.num_fds()
+                except (AttributeError, psutil.AccessDenied):
+                    pass
+
+                if self.debug_diagnostics:
+                    # 全ソケットを列挙するため毎 tick の取得は行わない
+                    try:
+                        network_connections = len(process.connections())
+                    except (psutil.AccessDenied, psutil.NoSuchProcess):
+                        pass
+
+                try:
+                    context_switches = process.num_ctx_switches().voluntary
+                except (AttributeError, psutil.AccessDenied):
+                    pass
+
+                process_name = process.name()
+
+            # ガベージコレクション情報（変化が緩やかで計測コストが高いため間引いて取得）
+            gc_objects = self._get_gc_object_count()
             
             # スレッド数
             active_threads = threading.active_count()
             
-            # 追加のシステム情報
-            file_descriptors = None
-            network_connections = None
-            context_switches = None
-            
-            try:
-                # Unix系システムでのみ利用可能
-                file_descriptors = self.process.num_fds()
-            except (AttributeError, psutil.AccessDenied):
-                pass
-            
-            try:
-                network_connections = len(self.process.connections())
-            except (psutil.AccessDenied, psutil.NoSuchProcess):
-                pass
-            
-            try:
-                context_switches = self.process.num_ctx_switches().voluntary
-            except (AttributeError, psutil.AccessDenied):
-                pass
-            
             # タイムスタンプ（JST）
-            timestamp = datetime.now(timezone(timedelta(hours=9))).isoformat()
+            timestamp = datetime.now(JST).isoformat()
             
             metrics = PerformanceMetrics(
                 timestamp=timestamp,
@@ -175,8 +198,8 @@ class PerformanceMonitor:
                 process_time=process_time,
                 gc_objects=gc_objects,
                 active_threads=active_threads,
-                process_id=self.process.pid,
-                process_name=self.process.name(),
+                process_id=process.pid,
+                process_name=process_name,
                 file_descriptors=file_descriptors,
                 network_connections=network_connections,
                 context_switches=context_switches
@@ -186,7 +209,7 @@ class PerformanceMonitor:
             
         except Exception as e:
             # エラーが発生した場合のフォールバック
-            timestamp = datetime.now(timezone(timedelta(hours=9))).isoformat()
+            timestamp = datetime.now(JST).isoformat()
             return PerformanceMetrics(
                 timestamp=timestamp,
                 memory_usage_mb=0.0,
@@ -199,6 +222,22 @@ class PerformanceMonitor:
                 process_name="unknown"
             )
     
+    def _get_gc_object_count(self, force: bool = False) -> int:
+        """GC追跡オブジェクト数を取得（GC_OBJECTS_SAMPLE_INTERVAL 内は前回値を返す）"""
+        now = time.monotonic()
+        cached = self._gc_objects_cache
+        if force or cached is None or now - cached[0] >= self.GC_OBJECTS_SAMPLE_INTERVAL:
+            cached = (now, len(gc.get_objects()))
+            self._gc_objects_cache = cached
+        return cached[1]
+    
+    def _get_rss_mb(self) -> float:
+        """RSS(MB)のみを取得（GC前後の差分測定用に全メトリクス収集を避ける）"""
+        try:
+            return self.process.memory_info().rss / 1024 / 1024
+        except Exception:
+            return 0.0
+    
     def _check_alerts(self, metrics: PerformanceMetrics) -> List[Dict[str, Any]]:
         """アラート条件をチェックして通知を生成"""
         alerts = []
@@ -324,25 +363,27 @@ class PerformanceMonitor:
         # 負荷レベル履歴に追加
         self.load_level_history.append(current_load)
         
-        # 設定で指定された最低測定回数後から調整開始
-        min_measurements = self.config.history_management.min_measurements_for_adjustment
-        if len(self.load_level_history) < min_measurements:
-            return
-            
-        # 過去の負荷レベルで安定性をチェック（最低測定回数を使用）
-        recent_levels = list(self.load_level_history)[-min_measurements:]
-        if len(set(recent_levels)) > 1:  # 負荷が不安定な場合は調整しない
-            return
-            
         # 新しい間隔を決定
         target_interval = self.interval_thresholds[f"{current_load}_load"]
+        min_measurements = self.config.history_management.min_measurements_for_adjustment
+        recent_levels = list(self.load_level_history)[-min_measurements:]
+        
+        # 間隔の短縮（負荷上昇）は即時に反映し、延長（負荷低下）のみ安定性を確認してから行う
+        if target_interval >= self.current_monitoring_interval:
+            # 設定で指定された最低測定回数後から調整開始
+            if len(self.load_level_history) < min_measurements:
+                return
+                
+            # 過去の負荷レベルで安定性をチェック（最低測定回数を使用）
+            if len(set(recent_levels)) > 1:  # 負荷が不安定な場合は調整しない
+                return
         
         # 間隔変更が必要かチェック
         if abs(self.current_monitoring_interval - target_interval) > 1.0:
             old_interval = self.current_monitoring_interval
             self.current_monitoring_interval = target_interval
             self.stats["interval_adjustments"] += 1
-            self.last_interval_adjustment = datetime.now(timezone(timedelta(hours=9)))
+            self.last_interval_adjustment = datetime.now(JST)
             
             if self.log_callback:
                 self.log_callback(
@@ -374,8 +415,8 @@ class PerformanceMonitor:
         """バックグラウンド監視ループ"""
         while self.is_monitoring:
             try:
-                # メトリクス収集
-                metrics = self.get_current_metrics()
+                # メトリクス収集（/proc 読み込み等の同期処理はイベントループを塞がないよう別スレッドで実行）
+                metrics = await asyncio.to_thread(self.get_current_metrics)
                 
                 # 履歴に追加（dequeが自動的にサイズ制限）
                 self.metrics_history.append(metrics)
@@ -489,23 +530,30 @@ class PerformanceMonitor:
     
     def force_gc_and_measure(self) -> Dict[str, Any]:
         """強制ガベージコレクション実行と効果測定"""
-        before_metrics = self.get_current_metrics()
+        memory_before_mb = self._get_rss_mb()
+        objects_before = self._get_gc_object_count(force=True)
         
-        # ガベージコレクション実行
-        gc.collect()
+        # ガベージコレクション実行（まず若い世代のみ回収し、RSSが十分に減らない場合だけ全世代へ拡大）
+        gc_generation = 1
+        collected = gc.collect(1)
+        memory_after_mb = self._get_rss_mb()
+        if memory_before_mb - memory_after_mb < self.gc_escalation_min_freed_mb:
+            gc_generation = 2
+            collected += gc.collect()
+            memory_after_mb = self._get_rss_mb()
         
-        # 少し待機してから測定
-        time.sleep(0.1)
-        after_metrics = self.get_current_metrics()
+        objects_after = self._get_gc_object_count(force=True)
         
         return {
-            "gc_executed_at": datetime.now(timezone(timedelta(hours=9))).isoformat(),
-            "memory_before_mb": before_metrics.memory_usage_mb,
-            "memory_after_mb": after_metrics.memory_usage_mb,
-            "memory_freed_mb": before_metrics.memory_usage_mb - after_metrics.memory_usage_mb,
-            "objects_before": before_metrics.gc_objects,
-            "objects_after": after_metrics.gc_objects,
-            "objects_freed": before_metrics.gc_objects - after_metrics.gc_objects
+            "gc_executed_at": datetime.now(JST).isoformat(),
+            "gc_generation": gc_generation,
+            "gc_collected": collected,
+            "memory_before_mb": memory_before_mb,
+            "memory_after_mb": memory_after_mb,
+            "memory_freed_mb": memory_before_mb - memory_after_mb,
+            "objects_before": objects_before,
+            "objects_after": objects_after,
+            "objects_freed": objects_before - objects_after
         }
     
     def get_load_analysis_report(self) -> Dict[str, Any]:
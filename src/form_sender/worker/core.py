@@ -115,6 +115,13 @@ def _get_button_keywords_config() -> ButtonKeywordsConfigType:
 _raw_logger = logging.getLogger(__name__)
 logger = get_secure_logger(__name__)
 
+# 復旧判定用の定数（呼び出しごとのリスト生成・小文字化を避けるため import 時に一度だけ構築）
+_RECOVERABLE_ERROR_TYPES = frozenset(["SYSTEM", "TIMEOUT", "ELEMENT_EXTERNAL", "INPUT_EXTERNAL", "ACCESS"])
+_NON_RECOVERABLE_MESSAGE_RE = re.compile(
+    "|".join(map(re.escape, ["instruction_valid", "placeholder", "json decode", "invalid selector", "malformed"])),
+    re.IGNORECASE,
+)
+
 
 # 本番環境判定とログレベル最適化
 def _should_log_detailed() -> bool:
@@ -138,8 +145,6 @@ class KeywordMatcher:
 
     def __init__(self, keywords: List[str]):
         """キーワードリストから正規表現パターンを事前コンパイル"""
-        import re
-
         try:
             if not keywords:
                 self.pattern = None
@@ -204,7 +209,6 @@ class FormSenderWorker:
         # DOM検索結果のキャッシュ（パフォーマンス最適化）
         self._selector_cache = {}
         self._cache_max_age = 30  # 秒
-        import time
 
         self._last_cache_clear = time.time()
         
@@ -542,8 +546,6 @@ class FormSenderWorker:
                 r"arguments\[",            # 引数の動的アクセス
             ]
 
-            import re
-
             # 重大な脅威の検出
             for pattern in critical_patterns:
                 matches = re.findall(pattern, script_content, re.IGNORECASE)
@@ -1098,7 +1100,6 @@ class FormSenderWorker:
 
     async def _wait_until_clickable(self, selector: str, timeout_ms: int) -> bool:
         """指定セレクタの要素が可視・有効になり、クリック可能になるまで待機する"""
-        import time
         deadline = time.time() + (timeout_ms / 1000)
         locator = self.page.locator(selector).first
 
@@ -1132,7 +1133,6 @@ class FormSenderWorker:
 
     async def _wait_until_element_clickable(self, element, timeout_ms: int) -> bool:
         """ElementHandleがクリック可能になるまで待機する（可視・有効・disabled属性なし）"""
-        import time
         deadline = time.time() + (timeout_ms / 1000)
         try:
             await element.wait_for_element_state("visible", timeout=timeout_ms)
@@ -1167,8 +1167,6 @@ class FormSenderWorker:
             "listener": None,
         }
 
-        import time
-
         start_time = time.time()
 
         def handle_response(response) -> None:
@@ -1260,8 +1258,6 @@ class FormSenderWorker:
 
     def _clear_selector_cache_if_needed(self) -> None:
         """必要に応じてセレクタキャッシュをクリア"""
-        import time
-
         current_time = time.time()
         if current_time - self._last_cache_clear > self._cache_max_age:
             self._selector_cache.clear()
@@ -1420,15 +1416,11 @@ class FormSenderWorker:
     def _is_recoverable_error(self, error_type: str, error_message: str) -> bool:
         """復旧可能なエラーかどうか判定（更新版）"""
         # 復旧可能なエラータイプ（新しい分類に対応）
-        recoverable_types = ["SYSTEM", "TIMEOUT", "ELEMENT_EXTERNAL", "INPUT_EXTERNAL", "ACCESS"]
-
-        if error_type not in recoverable_types:
+        if error_type not in _RECOVERABLE_ERROR_TYPES:
             return False
 
         # 特定のエラーメッセージパターンは復旧不可能
-        non_recoverable_patterns = ["instruction_valid", "placeholder", "json decode", "invalid selector", "malformed"]
-
-        if any(pattern in error_message.lower() for pattern in non_recoverable_patterns):
+        if error_message and _NON_RECOVERABLE_MESSAGE_RE.search(error_message):
             return False
 
         return True
@@ -3338,8 +3330,6 @@ class FormSenderWorker:
             "handler": None,
         }
 
-        import time
-
         start_time = time.time()
 
         def handle_response(response) -> None:
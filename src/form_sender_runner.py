@@ -15,17 +15,23 @@ IsolatedFormWorker で送信→結果を mark_done RPC で確定する。
 import argparse
 import asyncio
 import base64
+import fnmatch
+import glob
 import json
 import logging
+import math
 import multiprocessing as mp
 import os
+import re
 import signal
 import sys
 import threading
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta, date
 from functools import lru_cache
-from typing import Optional, Dict, Any, List, Tuple
+from itertools import islice
+from typing import Optional, Dict, Any, FrozenSet, List, Sequence, Set, Tuple
 
 from supabase import create_client
 import random
@@ -79,6 +85,11 @@ def _get_env_int(name: str) -> Optional[int]:
         return None
 
 
+def _env_str(name: str, default: str = '') -> str:
+    """環境変数を前後空白除去して返す（未設定・空なら default）。"""
+    return (os.environ.get(name) or '').strip() or default
+
+
 def _is_truthy(value: Optional[str]) -> bool:
     if value is None:
         return False
@@ -491,7 +502,7 @@ def _refresh_client_config_url_if_needed(current_url: str, client_config_object:
 def _is_test_mode_enabled() -> bool:
     if _is_truthy(os.getenv("FORM_SENDER_TEST_MODE")):
         return True
-    table_mode_env = (os.environ.get('FORM_SENDER_TABLE_MODE') or '').strip().lower()
+    table_mode_env = _env_str('FORM_SENDER_TABLE_MODE').lower()
     if table_mode_env == 'test':
         return True
     if USE_TEST_TABLE:
@@ -604,12 +615,15 @@ USE_TEST_TABLE = False
 FN_CLAIM = 'claim_next_batch'
 FN_MARK_DONE = 'mark_done'
 FN_REQUEUE = 'requeue_stale_assigned'
+# 1件処理ごとに参照する companies の取得列（テーブルモード確定時に一度だけ組み立てる）
+_COMPANY_BASE_COLUMNS = 'id, form_url, black, company_name'
+COMPANY_SELECT_COLUMNS = _COMPANY_BASE_COLUMNS
 
 
 def _resolve_table_mode(cli_mode: Optional[str]) -> str:
     candidates = [
         (cli_mode or '').strip().lower(),
-        (os.environ.get('FORM_SENDER_TABLE_MODE') or '').strip().lower(),
+        _env_str('FORM_SENDER_TABLE_MODE').lower(),
     ]
 
     meta = _load_job_execution_meta()
@@ -631,9 +645,9 @@ def _resolve_table_mode(cli_mode: Optional[str]) -> str:
 
 
 def _infer_mode_from_env_tables() -> Optional[str]:
-    company = (os.environ.get('COMPANY_TABLE') or '').strip().lower()
-    send_queue = (os.environ.get('SEND_QUEUE_TABLE') or '').strip().lower()
-    submissions = (os.environ.get('SUBMISSIONS_TABLE') or '').strip().lower()
+    company = _env_str('COMPANY_TABLE').lower()
+    send_queue = _env_str('SEND_QUEUE_TABLE').lower()
+    submissions = _env_str('SUBMISSIONS_TABLE').lower()
 
     tables = {company, send_queue, submissions}
     if any(table.endswith('_test') for table in tables if table):
@@ -646,6 +660,7 @@ def _infer_mode_from_env_tables() -> Optional[str]:
 def apply_table_mode(cli_mode: Optional[str] = None) -> None:
     global TABLE_MODE, COMPANY_TABLE, SEND_QUEUE_TABLE, SUBMISSIONS_TABLE
     global USE_EXTRA_TABLE, USE_TEST_TABLE, FN_CLAIM, FN_MARK_DONE, FN_REQUEUE
+    global COMPANY_SELECT_COLUMNS
 
     mode = _resolve_table_mode(cli_mode)
     TABLE_MODE = mode
@@ -653,9 +668,9 @@ def apply_table_mode(cli_mode: Optional[str] = None) -> None:
     USE_TEST_TABLE = mode == 'test'
 
     if USE_EXTRA_TABLE:
-        COMPANY_TABLE = os.environ.get('COMPANY_TABLE', 'companies_extra').strip() or 'companies_extra'
-        SEND_QUEUE_TABLE = os.environ.get('SEND_QUEUE_TABLE', 'send_queue_extra').strip() or 'send_queue_extra'
-        SUBMISSIONS_TABLE = os.environ.get('SUBMISSIONS_TABLE', 'submissions_extra').strip() or 'submissions_extra'
+        COMPANY_TABLE = _env_str('COMPANY_TABLE', 'companies_extra')
+        SEND_QUEUE_TABLE = _env_str('SEND_QUEUE_TABLE', 'send_queue_extra')
+        SUBMISSIONS_TABLE = _env_str('SUBMISSIONS_TABLE', 'submissions_extra')
         FN_CLAIM = 'claim_next_batch_extra'
         FN_MARK_DONE = 'mark_done_extra'
         FN_REQUEUE = 'requeue_stale_assigned_extra'
@@ -663,17 +678,20 @@ def apply_table_mode(cli_mode: Optional[str] = None) -> None:
         COMPANY_TABLE = 'companies'
         SEND_QUEUE_TABLE = 'send_queue_test'
         SUBMISSIONS_TABLE = 'submissions_test'
-        FN_CLAIM = (os.environ.get('SUPABASE_FN_CLAIM') or '').strip() or 'claim_next_batch_test'
-        FN_MARK_DONE = (os.environ.get('SUPABASE_FN_MARK_DONE') or '').strip() or 'mark_done_test'
-        FN_REQUEUE = (os.environ.get('SUPABASE_FN_REQUEUE') or '').strip() or 'requeue_stale_assigned_test'
+        FN_CLAIM = _env_str('SUPABASE_FN_CLAIM', 'claim_next_batch_test')
+        FN_MARK_DONE = _env_str('SUPABASE_FN_MARK_DONE', 'mark_done_test')
+        FN_REQUEUE = _env_str('SUPABASE_FN_REQUEUE', 'requeue_stale_assigned_test')
     else:
-        COMPANY_TABLE = os.environ.get('COMPANY_TABLE', 'companies').strip() or 'companies'
-        SEND_QUEUE_TABLE = os.environ.get('SEND_QUEUE_TABLE', 'send_queue').strip() or 'send_queue'
-        SUBMISSIONS_TABLE = os.environ.get('SUBMISSIONS_TABLE', 'submissions').strip() or 'submissions'
+        COMPANY_TABLE = _env_str('COMPANY_TABLE', 'companies')
+        SEND_QUEUE_TABLE = _env_str('SEND_QUEUE_TABLE', 'send_queue')
+        SUBMISSIONS_TABLE = _env_str('SUBMISSIONS_TABLE', 'submissions')
         FN_CLAIM = 'claim_next_batch'
         FN_MARK_DONE = 'mark_done'
         FN_REQUEUE = 'requeue_stale_assigned'
 
+    # companies_extra は client 一致検証のため client 列も取得する
+    COMPANY_SELECT_COLUMNS = _COMPANY_BASE_COLUMNS + (', client' if USE_EXTRA_TABLE else '')
+
     os.environ['FORM_SENDER_TABLE_MODE'] = TABLE_MODE
     os.environ['COMPANY_TABLE'] = COMPANY_TABLE
     os.environ['SEND_QUEUE_TABLE'] = SEND_QUEUE_TABLE
@@ -739,6 +757,24 @@ def _get_name_policy_exclude_keywords() -> List[str]:
     return default_words
 
 
+_NAME_POLICY_PATTERN_CACHE: Tuple[Optional[Tuple[str, ...]], Optional["re.Pattern[str]"]] = (None, None)
+
+
+def _get_name_policy_pattern(words: Sequence[str]) -> Optional["re.Pattern[str]"]:
+    """除外ワードを1本の正規表現にまとめ、ワード集合が変わらない限り再利用する。"""
+    global _NAME_POLICY_PATTERN_CACHE
+    key = tuple(words)
+    cached_key, cached_pattern = _NAME_POLICY_PATTERN_CACHE
+    if cached_key == key:
+        return cached_pattern
+    pattern = re.compile('|'.join(re.escape(w) for w in key)) if key else None
+    _NAME_POLICY_PATTERN_CACHE = (key, pattern)
+    return pattern
+
+
+_SANITIZE_DROP_KEYS = frozenset({"element"})  # 非シリアライズ（Playwright Locator など）
+
+
 def _sanitize_field_mapping_for_storage(field_mapping: Dict[str, Any]) -> Dict[str, Any]:
     """submissions.field_mapping に『マッピング結果全体』を保存できるようJSON安全化する。
 
@@ -748,7 +784,6 @@ def _sanitize_field_mapping_for_storage(field_mapping: Dict[str, Any]) -> Dict[s
     - ただし Playwright の Locator など JSON 非対応のオブジェクトは除去する。
     - dict/list は再帰的に処理し、シリアライズ不能な値は文字列化または無視する。
     """
-    import math
     # 最大再帰深さ（安全弁）
     try:
         max_depth = int(get_worker_config().get('storage', {}).get('sanitize_max_depth', 6))
@@ -760,34 +795,46 @@ def _sanitize_field_mapping_for_storage(field_mapping: Dict[str, Any]) -> Dict[s
     if not isinstance(field_mapping, dict):
         return {}
 
-    DROP_KEYS = {"element"}  # 非シリアライズ（Playwright Locator など）
+    DROP_KEYS = _SANITIZE_DROP_KEYS
+    # 全ノードで呼ばれる再帰のため、グローバル/属性参照をローカルに束縛しておく
+    _isinstance = isinstance
+    _isfinite = math.isfinite
+    _str = str
 
     def to_json_safe(value, depth: int = 0):
         if depth >= max_depth:
             return "<max_depth_reached>"
-        # プリミティブ
-        if value is None or isinstance(value, (str, bool, int)):
+        # プリミティブ（大半は str/int/bool/None なので型の同一性で先に返す）
+        tv = type(value)
+        if value is None or tv is _str or tv is int or tv is bool:
+            return value
+        if _isinstance(value, (str, bool, int)):
             return value
-        if isinstance(value, float):
+        if _isinstance(value, float):
             # NaN/Inf は null に落とす
-            return value if math.isfinite(value) else None
+            return value if _isfinite(value) else None
         # 配列系
-        if isinstance(value, (list, tuple, set)):
-            return [to_json_safe(v, depth + 1) for v in list(value)]
+        if _isinstance(value, (list, tuple, set)):
+            d1 = depth + 1
+            return [to_json_safe(v, d1) for v in list(value)]
         # 連想配列
-        if isinstance(value, dict):
+        if _isinstance(value, dict):
             out = {}
+            d1 = depth + 1
             for k, v in value.items():
-                # キーは文字列化（JSON仕様）
-                try:
-                    k_str = str(k)
-                except Exception:
-                    k_str = "__invalid_key__"
-                if k_str in DROP_KEYS:
-                    continue
                 if k in DROP_KEYS:
                     continue
-                out[k_str] = to_json_safe(v, depth + 1)
+                # キーは文字列化（JSON仕様）
+                if type(k) is _str:
+                    k_str = k
+                else:
+                    try:
+                        k_str = _str(k)
+                    except Exception:
+                        k_str = "__invalid_key__"
+                    if k_str in DROP_KEYS:
+                        continue
+                out[k_str] = to_json_safe(v, d1)
             return out
         # それ以外は文字列化（代表値として保持）
         try:
@@ -838,9 +885,10 @@ class _LifecycleOnlyFilter(logging.Filter):
 def _get_lifecycle_logger() -> logging.Logger:
     """開始/完了専用のライフサイクルロガーを作成（INFOを必ず表示）。"""
     log = logging.getLogger("form_sender.lifecycle")
-    log.setLevel(logging.INFO)
     # 独自ハンドラー（rootに依存しない）
+    # setLevel は全ロガーのレベルキャッシュを破棄するため、初回構成時のみ行う
     if not log.handlers:
+        log.setLevel(logging.INFO)
         handler = logging.StreamHandler()
         handler.setLevel(logging.INFO)
         handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
@@ -876,48 +924,135 @@ def _install_logging_policy_for_ci():
         pass
 
 
+# RPC エラーメッセージ（小文字化済み）の判定パターン。語句ごとの部分一致走査を1回の検索にまとめる
+_RPC_MISSING_FUNCTION_RE = re.compile(r'does not exist|no function matches|undefined function')
+_RPC_PARAM_MISMATCH_RE = re.compile(r'parameter|argument|unexpected|unknown|named|mismatch')
+# 通信系の例外はシグネチャ不一致を表さないため、メッセージを文字列化せずに非フォールバックと判定する
+_RPC_TRANSPORT_EXC_TYPES = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+
 def _should_fallback_on_rpc_error(exc: Exception, fn_name: str, new_param_keys: List[str]) -> bool:
     """新旧RPCのフォールバック可否を判定。
 
     - フォールバックは『関数が存在しない/シグネチャ不一致』に限定する。
     - それ以外（実行時例外、権限、業務ガード等）はフォールバックしない。
     """
+    if isinstance(exc, _RPC_TRANSPORT_EXC_TYPES):
+        return False
     try:
         msg = (str(exc) or '').lower()
         fn_l = fn_name.lower()
         # 関数未存在/型不一致
-        patterns_fn = [
-            'does not exist',
-            'no function matches',
-            'undefined function',
-        ]
-        if fn_l in msg and any(p in msg for p in patterns_fn):
+        if fn_l in msg and _RPC_MISSING_FUNCTION_RE.search(msg):
             return True
         # パラメータ不一致（新規キーがエラーに含まれる）
-        if any(k.lower() in msg for k in (new_param_keys or [])) and any(s in msg for s in [
-            'parameter', 'argument', 'unexpected', 'unknown', 'named', 'mismatch'
-        ]):
+        if any(k.lower() in msg for k in (new_param_keys or [])) and _RPC_PARAM_MISMATCH_RE.search(msg):
             return True
     except Exception:
         return False
     return False
 
 
+def _rpc_mark_done(supabase, md_args: Dict[str, Any]) -> None:
+    """mark_done RPC（run_id検証付き）を呼び出す。
+
+    シグネチャ不一致時のみ p_run_id なし → 旧関数名（extra 以外）へ段階的にフォールバックし、
+    それ以外のエラーはそのまま送出する。フォールバック時は md_args から p_run_id を取り除く。
+    """
+    try:
+        resp = supabase.rpc(FN_MARK_DONE, md_args).execute()
+    except Exception as e_md:
+        if not _should_fallback_on_rpc_error(e_md, FN_MARK_DONE, ['p_run_id']):
+            raise
+        md_args.pop('p_run_id', None)
+        try:
+            resp = supabase.rpc(FN_MARK_DONE, md_args).execute()
+        except Exception as e_md_f:
+            if (not USE_EXTRA_TABLE) and _should_fallback_on_rpc_error(e_md_f, FN_MARK_DONE, []):
+                resp = supabase.rpc('mark_done', md_args).execute()
+            else:
+                raise
+    # キュー行を更新できた（= submissions へ記録された）場合のみ、当日送信済みとして覚えておく。
+    # run_id 不一致時は 0 が返り submissions は記録されない
+    updated = getattr(resp, 'data', None)
+    if type(updated) is int and updated > 0:
+        _remember_sent_today(md_args.get('p_targeting_id'), md_args.get('p_target_date'), md_args.get('p_company_id'))
+
+
 def jst_today() -> date:
-    return (datetime.utcnow() + timedelta(hours=9)).date()
+    return datetime.now(JST).date()
 
 
 def jst_now() -> datetime:
-    return datetime.now(timezone(timedelta(hours=9)))
+    return datetime.now(JST)
 
 def jst_utc_bounds(d: date):
     """指定JST日付のUTC境界 (start_utc, end_utc) を返す"""
-    jst = timezone(timedelta(hours=9))
-    start_jst = datetime(d.year, d.month, d.day, 0, 0, 0, tzinfo=jst)
+    start_jst = datetime(d.year, d.month, d.day, 0, 0, 0, tzinfo=JST)
     end_jst = start_jst + timedelta(days=1)
     return (start_jst.astimezone(timezone.utc), end_jst.astimezone(timezone.utc))
 
 
+@lru_cache(maxsize=8)
+def jst_utc_bound_strings(d: date) -> Tuple[str, str]:
+    """submitted_at フィルタ用に、指定JST日付のUTC境界を 'Z' 付きISO文字列で返す（日付ごとに一度だけ整形）"""
+    start_utc, end_utc = jst_utc_bounds(d)
+    return (
+        start_utc.isoformat().replace('+00:00', 'Z'),
+        end_utc.isoformat().replace('+00:00', 'Z'),
+    )
+
+
+def _count_same_day_submissions(supabase, targeting_id: int, company_id: int, target_date: date) -> int:
+    """指定JST日付に同一 targeting/company の submissions が存在するか（0 または 1 以上）を返す"""
+    start_iso, end_iso = jst_utc_bound_strings(target_date)
+    dup = (
+        supabase.table(SUBMISSIONS_TABLE)
+        .select('id', count='exact')
+        .eq('targeting_id', targeting_id)
+        .eq('company_id', company_id)
+        .gte('submitted_at', start_iso)
+        .lt('submitted_at', end_iso)
+        .limit(1)
+        .execute()
+    )
+    dup_cnt = getattr(dup, 'count', None)
+    if not isinstance(dup_cnt, int):
+        dup_cnt = len(getattr(dup, 'data', []) or [])
+    return dup_cnt
+
+
+def _fetch_company_row(supabase, company_id: int):
+    """処理対象企業を1件取得する（同期クライアントのため呼び出し側で別スレッド実行する）"""
+    # ブラックリスト回避: companies.black が NULL のもののみ処理対象
+    return (
+        supabase.table(COMPANY_TABLE)
+        .select(COMPANY_SELECT_COLUMNS)
+        .eq('id', company_id)
+        .limit(1)
+        .execute()
+    )
+
+
+# 当日すでに submissions が存在すると確認済みの company_id（targeting_id, JST日付ごと）。
+# submissions は削除されないため「存在する」結果だけを保持し、再クレーム時の重複確認クエリを省く
+_SENT_TODAY: Dict[Tuple[int, str], Set[int]] = {}
+
+
+def _is_known_sent_today(targeting_id: Any, target_date: Any, company_id: Any) -> bool:
+    return company_id in _SENT_TODAY.get((targeting_id, str(target_date)), ())
+
+
+def _remember_sent_today(targeting_id: Any, target_date: Any, company_id: Any) -> None:
+    key = (targeting_id, str(target_date))
+    sent = _SENT_TODAY.get(key)
+    if sent is None:
+        # 日付が変わったら前日分は不要
+        _SENT_TODAY.clear()
+        sent = _SENT_TODAY[key] = set()
+    sent.add(company_id)
+
+
 def _build_failure_classify_detail(error_type: Optional[str], base_detail: Optional[Dict[str, Any]], evidence: Dict[str, Any]) -> Dict[str, Any]:
     """失敗時のclassify_detailを一元生成（PROHIBITION_DETECTEDを優先補正）。"""
     try:
@@ -1080,9 +1215,42 @@ def _extract_max_daily_sends(client_data: Dict[str, Any]) -> Optional[int]:
     except Exception:
         return None
 
+@dataclass(frozen=True)
+class _TargetingSettings:
+    """claim 毎に参照する targeting/ポリシー設定。実行中は変化しないため一度だけ抽出する。"""
+
+    max_daily_sends: Optional[int]
+    extra_client_name: Optional[str]
+    name_policy_words: Tuple[str, ...]
+    name_policy_pattern: Optional["re.Pattern[str]"]
+
+
+_TARGETING_SETTINGS_CACHE: Optional[Tuple[Dict[str, Any], bool, _TargetingSettings]] = None
+
+
+def _get_targeting_settings(client_data: Dict[str, Any]) -> _TargetingSettings:
+    """client_data から _TargetingSettings を組み立てる（同一 client_data・同一テーブルモードなら再利用）。"""
+    global _TARGETING_SETTINGS_CACHE
+    cached = _TARGETING_SETTINGS_CACHE
+    if cached is not None and cached[0] is client_data and cached[1] == USE_EXTRA_TABLE:
+        return cached[2]
+    words = _get_name_policy_exclude_keywords()
+    settings = _TargetingSettings(
+        max_daily_sends=_extract_max_daily_sends(client_data),
+        extra_client_name=_extract_extra_client_name(client_data),
+        name_policy_words=tuple(words),
+        name_policy_pattern=_get_name_policy_pattern(words),
+    )
+    _TARGETING_SETTINGS_CACHE = (client_data, USE_EXTRA_TABLE, settings)
+    return settings
+
+
 _SUCC_CACHE: Dict[str, Any] = {}
 # 失敗分類の軽量キャッシュ（同一メッセージの連続多発時の負荷抑制）
+# エントリ毎に {'detail','ts'} の dict を作らないよう、分類結果と登録時刻を同一キーの2つの dict で保持する
+# （挿入/削除は常に両方へ同時に行うため、挿入順＝古い順も一致する）
 _CLASSIFY_CACHE: Dict[str, Any] = {}
+_CLASSIFY_CACHE_TS: Dict[str, float] = {}
 CLASSIFY_CACHE_MAX_SIZE = 256
 CLASSIFY_CACHE_TTL_SEC = 600  # 10分で自然失効（設定で上書き可）
 
@@ -1102,23 +1270,21 @@ def _prune_classify_cache(now_ts: float) -> None:
     """TTL とサイズに基づいて簡易的にキャッシュを整理。"""
     try:
         max_size, ttl = _get_classify_cache_limits()
-        # TTL 期限切れを最大16件だけ掃除（安全のためキーを一度リスト化）
+        # TTL 期限切れを最大16件だけ掃除（安全のため先頭64件のキーのみ一度リスト化）
         removed = 0
-        keys_snapshot = list(_CLASSIFY_CACHE.keys())[:64]
+        keys_snapshot = list(islice(_CLASSIFY_CACHE_TS, 64))
         for k in keys_snapshot:
-            ent = _CLASSIFY_CACHE.get(k)
-            if not isinstance(ent, dict):
-                _CLASSIFY_CACHE.pop(k, None)
-                removed += 1
-            elif now_ts - ent.get('ts', 0) > ttl:
+            if now_ts - _CLASSIFY_CACHE_TS.get(k, 0) > ttl:
+                _CLASSIFY_CACHE_TS.pop(k, None)
                 _CLASSIFY_CACHE.pop(k, None)
                 removed += 1
-            if removed >= 16:
-                break
+                if removed >= 16:
+                    break
         # サイズ超過なら古い順に削除
-        while len(_CLASSIFY_CACHE) > max_size:
+        while len(_CLASSIFY_CACHE_TS) > max_size:
             try:
-                oldest_key = next(iter(_CLASSIFY_CACHE))
+                oldest_key = next(iter(_CLASSIFY_CACHE_TS))
+                _CLASSIFY_CACHE_TS.pop(oldest_key, None)
                 _CLASSIFY_CACHE.pop(oldest_key, None)
             except StopIteration:
                 break
@@ -1147,10 +1313,10 @@ def _classify_failure_detail(err_msg: Optional[str], add_data: Optional[Dict[str
         cache_key = hashlib.sha1(raw_key.encode('utf-8', errors='ignore')).hexdigest()
 
         now_ts = _time.time()
-        ent = _CLASSIFY_CACHE.get(cache_key)
+        ent_ts = _CLASSIFY_CACHE_TS.get(cache_key)
         max_size, ttl = _get_classify_cache_limits()
-        if ent and isinstance(ent, dict) and (now_ts - ent.get('ts', 0) <= ttl):
-            detail = ent.get('detail')
+        if ent_ts is not None and (now_ts - ent_ts <= ttl):
+            detail = _CLASSIFY_CACHE.get(cache_key)
         else:
             try:
                 detail = ErrorClassifier.classify_detail(
@@ -1163,7 +1329,8 @@ def _classify_failure_detail(err_msg: Optional[str], add_data: Optional[Dict[str
                 # 失敗分類の例外は握りつぶし、処理継続を最優先
                 logger.warning(f"detail classification error (suppressed): {type(e).__name__}: {e}")
                 return None, None
-            _CLASSIFY_CACHE[cache_key] = {'detail': detail, 'ts': now_ts}
+            _CLASSIFY_CACHE[cache_key] = detail
+            _CLASSIFY_CACHE_TS[cache_key] = now_ts
             _prune_classify_cache(now_ts)
 
         # bot 補助判定
@@ -1185,6 +1352,26 @@ def _classify_failure_detail(err_msg: Optional[str], add_data: Optional[Dict[str
         return None, None
 
 
+_EVIDENCE_WORDS_LIMIT = 5
+_SUCCESS_MATCH_KEYS = ('success_matches', 'element_success_matches')
+# matched_patterns: 早期失敗ゲートの厳格パターン（文字列のリスト）
+_FAILURE_MATCH_KEYS = ('error_matches', 'visible_error_elements', 'matched_patterns')
+
+
+def _iter_match_texts(details: Dict[str, Any], keys: Tuple[str, ...]):
+    """判定詳細の一致リストから検出ワード（先頭80文字）を順に返す。"""
+    for key in keys:
+        for m in (details.get(key) or []):
+            if isinstance(m, dict):
+                t = m.get('text') or ''
+            elif key == 'matched_patterns' and isinstance(m, str):
+                t = m
+            else:
+                continue
+            if t:
+                yield t[:80]
+
+
 def _extract_evidence_from_additional(add_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     """Workerのadditional_dataから、DB保存用の根拠情報を抽出する。
     - 検出ワード（成功/失敗）
@@ -1205,35 +1392,16 @@ def _extract_evidence_from_additional(add_data: Optional[Dict[str, Any]]) -> Dic
         if not isinstance(details, dict):
             details = {}
 
-        # 検出ワード（成功側）
+        # 検出ワード（成功側/失敗側）。各ソースを1パスで走査し、上限件数に達したら打ち切る
         success_words: List[str] = []
         try:
-            for m in (details.get('success_matches') or []):
-                t = (m.get('text') or '') if isinstance(m, dict) else ''
-                if t:
-                    success_words.append(t[:80])
-            for m in (details.get('element_success_matches') or []):
-                t = (m.get('text') or '') if isinstance(m, dict) else ''
-                if t:
-                    success_words.append(t[:80])
+            success_words = list(islice(_iter_match_texts(details, _SUCCESS_MATCH_KEYS), _EVIDENCE_WORDS_LIMIT))
         except Exception:
             pass
 
-        # 検出ワード（失敗側）
         failure_words: List[str] = []
         try:
-            for m in (details.get('error_matches') or []):
-                t = (m.get('text') or '') if isinstance(m, dict) else ''
-                if t:
-                    failure_words.append(t[:80])
-            for m in (details.get('visible_error_elements') or []):
-                t = (m.get('text') or '') if isinstance(m, dict) else ''
-                if t:
-                    failure_words.append(t[:80])
-            # 早期失敗ゲートの厳格パターン
-            for p in (details.get('matched_patterns') or []):
-                if isinstance(p, str) and p:
-                    failure_words.append(p[:80])
+            failure_words = list(islice(_iter_match_texts(details, _FAILURE_MATCH_KEYS), _EVIDENCE_WORDS_LIMIT))
         except Exception:
             pass
 
@@ -1330,8 +1498,8 @@ def _extract_evidence_from_additional(add_data: Optional[Dict[str, Any]]) -> Dic
             prohibition_confidence_score = None
 
         evidence.update({
-            'detected_success_words': success_words[:5] if success_words else [],
-            'detected_failure_words': failure_words[:5] if failure_words else [],
+            'detected_success_words': success_words,
+            'detected_failure_words': failure_words,
             'http_status': http_status,
             'redirect_urls': redirect_urls[:5] if redirect_urls else [],
             'final_url': final_url,
@@ -1353,31 +1521,45 @@ def _extract_evidence_from_additional(add_data: Optional[Dict[str, Any]]) -> Dic
     except Exception:
         return evidence
 
+@lru_cache(maxsize=None)
+def _get_success_count_cache_seconds() -> int:
+    try:
+        return int(get_worker_config().get('runner', {}).get('success_count_cache_seconds', 30))
+    except Exception:
+        return 30
+
+
 def _get_success_count_today_jst(supabase, targeting_id: int, target_date: date) -> int:
     """当日(JST)成功数をUTC境界で集計"""
     try:
-        # キャッシュキー（targeting_id + JST日付文字列）
+        # キャッシュキー（targeting_id + JST日付文字列）。ヒット時は設定参照なしで即返す
         key = f"{targeting_id}:{target_date.isoformat()}"
-        cfg = get_worker_config().get('runner', {})
-        cache_sec = int(cfg.get('success_count_cache_seconds', 30))
         now = _time.time()
         ent = _SUCC_CACHE.get(key)
-        if ent and (now - ent.get('ts', 0) < cache_sec):
-            return int(ent.get('count', 0))
-
-        start_utc, end_utc = jst_utc_bounds(target_date)
-        resp = (
-            supabase.table(SUBMISSIONS_TABLE)
-            .select('id', count='exact')
-            .eq('targeting_id', targeting_id)
-            .eq('success', True)
-            .gte('submitted_at', start_utc.isoformat().replace('+00:00', 'Z'))
-            .lt('submitted_at', end_utc.isoformat().replace('+00:00', 'Z'))
-            .execute()
-        )
+        if ent and (now - ent['ts'] < _get_success_count_cache_seconds()):
+            return ent['count']
+
+        start_iso, end_iso = jst_utc_bound_strings(target_date)
+
+        def _query(limit: Optional[int]):
+            q = (
+                supabase.table(SUBMISSIONS_TABLE)
+                .select('id', count='exact')
+                .eq('targeting_id', targeting_id)
+                .eq('success', True)
+                .gte('submitted_at', start_iso)
+                .lt('submitted_at', end_iso)
+            )
+            if limit is not None:
+                q = q.limit(limit)
+            return q.execute()
+
+        # 件数は count=exact（Content-Range）で取得し、行データは1件に抑えて転送量を削減
+        resp = _query(1)
         cnt = getattr(resp, 'count', None)
         if not isinstance(cnt, int):
-            data = getattr(resp, 'data', None) or []
+            # count が返らない環境のみ従来どおり全件取得して数える
+            data = getattr(_query(None), 'data', None) or []
             cnt = len(data)
         # 更新
         _SUCC_CACHE[key] = {'count': int(cnt), 'ts': now}
@@ -1386,46 +1568,130 @@ def _get_success_count_today_jst(supabase, targeting_id: int, target_date: date)
         return 0
 
 
+def _bump_success_count_cache(targeting_id: int, target_date: date) -> None:
+    """自ワーカーの成功を当日成功数キャッシュへ即時反映する。
+
+    他ワーカーの成功分は TTL 失効後の再集計で取り込まれる。
+    """
+    try:
+        ent = _SUCC_CACHE.get(f"{targeting_id}:{target_date.isoformat()}")
+        if ent:
+            ent['count'] = int(ent.get('count', 0)) + 1
+    except Exception:
+        pass
+
+
 def _resolve_client_config_path(pattern: str) -> str:
     # ワイルドカード対応: 最も新しいファイルを選択
     if '*' in pattern:
-        import glob
-        files = glob.glob(pattern)
-        if not files:
+        dir_part, name_pattern = os.path.split(pattern)
+        if any(c in dir_part for c in '*?['):
+            files = glob.glob(pattern)
+            if not files:
+                raise FileNotFoundError(f'No client_config file matches: {pattern}')
+            return max(files, key=os.path.getmtime)
+        # ディレクトリを1回だけ走査し、ファイル名で絞り込んだ候補のみ stat して最新を1パスで選ぶ
+        newest_path: Optional[str] = None
+        newest_mtime = 0.0
+        try:
+            with os.scandir(dir_part or '.') as it:
+                for entry in it:
+                    name = entry.name
+                    # glob と同様に隠しファイルはパターンが '.' 始まりの場合のみ対象
+                    if name.startswith('.') and not name_pattern.startswith('.'):
+                        continue
+                    if not fnmatch.fnmatchcase(name, name_pattern):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except FileNotFoundError:
+                        continue
+                    if newest_path is None or mtime > newest_mtime:
+                        newest_path = os.path.join(dir_part, name)
+                        newest_mtime = mtime
+        except (FileNotFoundError, NotADirectoryError):
+            newest_path = None
+        if newest_path is None:
             raise FileNotFoundError(f'No client_config file matches: {pattern}')
-        files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-        return files[0]
+        return newest_path
     return pattern
 
 
-def _within_business_hours(client_data: Dict[str, Any]) -> bool:
+# 営業時間判定用の解析済みスケジュール（client_data の同一性 + 参照値で有効性を確認）
+_SendSchedule = Tuple[Optional[FrozenSet[Any]], Optional[int], Optional[int]]
+_VALID_WEEKDAYS = frozenset(range(7))
+_SCHEDULE_CACHE: Optional[Tuple[int, Tuple[Any, Any, Any], _SendSchedule]] = None
+
+
+def _to_minutes(value: Any) -> Optional[int]:
+    if not value:
+        return None
     try:
-        targeting = client_data.get('targeting', {})
-        days = targeting.get('send_days_of_week')
-        start = targeting.get('send_start_time')  # 'HH:MM'
-        end = targeting.get('send_end_time')
+        hh, mm = value.split(':')
+        return int(hh) * 60 + int(mm)
+    except Exception:
+        return None
 
-        if isinstance(days, str):
-            try:
-                days = json.loads(days)
-            except Exception:
-                days = None
 
-        now_jst = jst_now()
-        if isinstance(days, list) and len(days) > 0:
-            # 0=Mon ... 6=Sun（Python weekday互換）
-            if now_jst.weekday() not in days:
-                return False
+def _get_send_schedule(client_data: Dict[str, Any]) -> _SendSchedule:
+    """targeting の送信曜日/時間帯を (days, start_min, end_min) に解析して返す。
+
+    ループ毎に呼ばれるため、同一 client_data かつ参照値が変わらない限り前回の解析結果を再利用する。
+    """
+    global _SCHEDULE_CACHE
+    targeting = client_data.get('targeting', {})
+    raw = (
+        targeting.get('send_days_of_week'),
+        targeting.get('send_start_time'),  # 'HH:MM'
+        targeting.get('send_end_time'),
+    )
+    cached = _SCHEDULE_CACHE
+    if cached is not None and cached[0] == id(client_data) and cached[1] == raw:
+        return cached[2]
+
+    days, start, end = raw
+    if isinstance(days, str):
+        try:
+            days = json.loads(days)
+        except Exception:
+            days = None
+    if isinstance(days, list) and len(days) > 0:
+        # 曜日判定はループ毎に行うため、O(1) で引ける frozenset にしておく。
+        # 0-6 以外の値はどの曜日にも一致しないため、集合演算1回で除外と検証を兼ねる
+        try:
+            days_set = frozenset(days)
+        except TypeError:
+            days_set = frozenset(d for d in days if isinstance(d, int))
+        days = days_set & _VALID_WEEKDAYS
+        if len(days) != len(days_set):
+            logger.warning("send_days_of_week contains values outside 0-6; they are ignored")
+    else:
+        days = None
+
+    start_min = _to_minutes(start)
+    end_min = _to_minutes(end)
+    if start_min is None or end_min is None:
+        start_min = end_min = None
+
+    schedule: _SendSchedule = (days, start_min, end_min)
+    _SCHEDULE_CACHE = (id(client_data), raw, schedule)
+    return schedule
 
-        def to_minutes(s: str) -> int:
-            hh, mm = s.split(':')
-            return int(hh) * 60 + int(mm)
 
-        if not start or not end:
+def _within_business_hours(client_data: Dict[str, Any]) -> bool:
+    try:
+        days, start_min, end_min = _get_send_schedule(client_data)
+
+        now_jst = jst_now()
+        # 0=Mon ... 6=Sun（Python weekday互換）
+        if days is not None and now_jst.weekday() not in days:
+            return False
+
+        if start_min is None or end_min is None:
             return True
         cur_min = now_jst.hour * 60 + now_jst.minute
         # GAS側の実装に合わせて終了時刻を含む（<= end）
-        return to_minutes(start) <= cur_min <= to_minutes(end)
+        return start_min <= cur_min <= end_min
     except Exception:
         return True
 
@@ -1446,7 +1712,10 @@ async def _process_one(
         had_work: True if何らかの処理・再割当てを行った
         had_error: True if RPC などのエラーが発生し、キュー空判定には利用できない
     """
-    expected_extra_client = _extract_extra_client_name(client_data)
+    settings = _get_targeting_settings(client_data)
+    # ログ用の worker_id は1回だけ取得して使い回す
+    wid = getattr(worker, 'worker_id', 0)
+    expected_extra_client = settings.extra_client_name
     matched_extra_client: Optional[str] = None
     # 1) claim（固定 company_id が指定された場合は claim をスキップ）
     if fixed_company_id is None:
@@ -1459,7 +1728,7 @@ async def _process_one(
         }
         try:
             # 日次上限が設定されている場合は、同名の拡張版（p_max_daily付き）で呼び出し。
-            max_daily = _extract_max_daily_sends(client_data)
+            max_daily = settings.max_daily_sends
             if max_daily is not None and max_daily > 0:
                 cap_params = dict(params)
                 cap_params['p_max_daily'] = max_daily
@@ -1513,7 +1782,6 @@ async def _process_one(
             queue_assigned_at = None
         # 処理開始ログ（最小限、IDのみ）
         try:
-            wid = getattr(worker, 'worker_id', 0)
             _get_lifecycle_logger().info(
                 f"process_start: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}"
             )
@@ -1523,7 +1791,6 @@ async def _process_one(
         company_id = int(fixed_company_id)
         # 固定ID指定時も開始を記録
         try:
-            wid = getattr(worker, 'worker_id', 0)
             _get_lifecycle_logger().info(
                 f"process_start: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}"
             )
@@ -1531,18 +1798,9 @@ async def _process_one(
             pass
 
     # 2) fetch company
+    # 同期クライアントの往復待ちでイベントループを塞がないよう、企業取得・重複確認は別スレッドで実行する
     try:
-        # ブラックリスト回避: companies.black が NULL のもののみ処理対象
-        company_columns = 'id, form_url, black, company_name'
-        if USE_EXTRA_TABLE:
-            company_columns += ', client'
-        comp = (
-            supabase.table(COMPANY_TABLE)
-            .select(company_columns)
-            .eq('id', company_id)
-            .limit(1)
-            .execute()
-        )
+        comp = await asyncio.to_thread(_fetch_company_row, supabase, company_id)
         if not comp.data:
             raise RuntimeError('company not found')
         company = comp.data[0]
@@ -1564,11 +1822,15 @@ async def _process_one(
                 raise ExtraClientMismatchError(company_id, expected_extra_client, actual_client, 'companies_extra.client mismatch')
             matched_extra_client = actual_client
             company['client'] = actual_client
-        # まず企業名ポリシーでの除外判定を先行させ、後続の重複チェック(追加クエリ)を省略して負荷を下げる
+        # 企業名ポリシーでの除外判定を重複チェック結果の待機より先に行う
         try:
             cname = company.get('company_name') or ''
-            policy_words = _get_name_policy_exclude_keywords()
-            matched = [w for w in policy_words if isinstance(cname, str) and (w in cname)]
+            policy_words = settings.name_policy_words
+            policy_pattern = settings.name_policy_pattern
+            matched: List[str] = []
+            # 大半の企業は非該当のため、正規表現1回で判定し、該当時のみ一致ワードを列挙する
+            if isinstance(cname, str) and policy_pattern is not None and policy_pattern.search(cname):
+                matched = [w for w in policy_words if w in cname]
             if matched:
                 classify_detail = {
                     'code': 'SKIPPED_BY_NAME_POLICY',
@@ -1592,22 +1854,8 @@ async def _process_one(
                     'p_submitted_at': jst_now().isoformat(),
                     'p_run_id': run_id,
                 }
+                _rpc_mark_done(supabase, _md_args)
                 try:
-                    supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                except Exception as e_mdnp:
-                    if _should_fallback_on_rpc_error(e_mdnp, FN_MARK_DONE, ['p_run_id']):
-                        _md_args.pop('p_run_id', None)
-                        try:
-                            supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                        except Exception as e_mdnp2:
-                            if (not USE_EXTRA_TABLE) and _should_fallback_on_rpc_error(e_mdnp2, FN_MARK_DONE, []):
-                                supabase.rpc('mark_done', _md_args).execute()
-                            else:
-                                raise
-                    else:
-                        raise
-                try:
-                    wid = getattr(worker, 'worker_id', 0)
                     _get_lifecycle_logger().info(
                         f"process_done: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}, success=False, reason=SKIPPED_BY_NAME_POLICY"
                     )
@@ -1619,21 +1867,16 @@ async def _process_one(
             pass
         # 当日すでに submissions 記録がある場合はスキップ（DB側JOINを外したため、ここで一意性を担保）
         try:
-            start_utc, end_utc = jst_utc_bounds(target_date)
-            dup = (
-                supabase.table(SUBMISSIONS_TABLE)
-                .select('id', count='exact')
-                .eq('targeting_id', targeting_id)
-                .eq('company_id', company_id)
-                .gte('submitted_at', start_utc.isoformat().replace('+00:00', 'Z'))
-                .lt('submitted_at', end_utc.isoformat().replace('+00:00', 'Z'))
-                .limit(1)
-                .execute()
-            )
-            dup_cnt = getattr(dup, 'count', None)
-            if not isinstance(dup_cnt, int):
-                dup_cnt = len(getattr(dup, 'data', []) or [])
+            # 送信済みと確認済みの企業はクエリせず重複扱い。
+            # 重複確認（count='exact'）は企業名ポリシー等のローカル判定を通過した企業に対してのみ発行する
+            if _is_known_sent_today(targeting_id, target_date, company_id):
+                dup_cnt = 1
+            else:
+                dup_cnt = await asyncio.to_thread(
+                    _count_same_day_submissions, supabase, targeting_id, company_id, target_date
+                )
             if dup_cnt and dup_cnt > 0:
+                _remember_sent_today(targeting_id, target_date, company_id)
                 classify_detail = {
                     'code': 'SKIPPED_ALREADY_SENT_TODAY',
                     'category': 'POLICY',
@@ -1653,22 +1896,8 @@ async def _process_one(
                     'p_submitted_at': jst_now().isoformat(),
                     'p_run_id': run_id,
                 }
+                _rpc_mark_done(supabase, _md_args)
                 try:
-                    supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                except Exception as e_mdsk:
-                    if _should_fallback_on_rpc_error(e_mdsk, FN_MARK_DONE, ['p_run_id']):
-                        _md_args.pop('p_run_id', None)
-                        try:
-                            supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                        except Exception as e_mdsk2:
-                            if (not USE_EXTRA_TABLE) and _should_fallback_on_rpc_error(e_mdsk2, FN_MARK_DONE, []):
-                                supabase.rpc('mark_done', _md_args).execute()
-                            else:
-                                raise
-                    else:
-                        raise
-                try:
-                    wid = getattr(worker, 'worker_id', 0)
                     _get_lifecycle_logger().info(
                         f"process_done: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}, success=False, reason=SKIPPED_ALREADY_SENT_TODAY"
                     )
@@ -1694,7 +1923,6 @@ async def _process_one(
                     q = q.eq('assigned_at', queue_assigned_at)
                 q.execute()
                 try:
-                    wid = getattr(worker, 'worker_id', 0)
                     _get_lifecycle_logger().info(
                         f"requeue_on_dupcheck_error: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}"
                     )
@@ -1746,22 +1974,8 @@ async def _process_one(
             'p_submitted_at': jst_now().isoformat(),
             'p_run_id': run_id,
         }
+        _rpc_mark_done(supabase, _md_args)
         try:
-            supabase.rpc(FN_MARK_DONE, _md_args).execute()
-        except Exception as e_mdmsc:
-            if _should_fallback_on_rpc_error(e_mdmsc, FN_MARK_DONE, ['p_run_id']):
-                _md_args.pop('p_run_id', None)
-                try:
-                    supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                except Exception as e_mdmsc2:
-                    if (not USE_EXTRA_TABLE) and _should_fallback_on_rpc_error(e_mdmsc2, FN_MARK_DONE, []):
-                        supabase.rpc('mark_done', _md_args).execute()
-                    else:
-                        raise
-            else:
-                raise
-        try:
-            wid = getattr(worker, 'worker_id', 0)
             _get_lifecycle_logger().info(
                 f"process_done: company_id={e_client.company_id}, worker_id={wid}, targeting_id={targeting_id}, success=False, reason=SKIPPED_WRONG_CLIENT"
             )
@@ -1791,24 +2005,9 @@ async def _process_one(
             'p_submitted_at': jst_now().isoformat(),
             'p_run_id': run_id,
         }
-        try:
-            supabase.rpc(FN_MARK_DONE, _md_args).execute()
-        except Exception as e_md:
-            # フォールバックはシグネチャ不一致のみ（安全弁）。それ以外は中断。
-            if _should_fallback_on_rpc_error(e_md, FN_MARK_DONE, ['p_run_id']):
-                _md_args.pop('p_run_id', None)
-                try:
-                    supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                except Exception as e_md_f:
-                    if (not USE_EXTRA_TABLE) and _should_fallback_on_rpc_error(e_md_f, FN_MARK_DONE, []):
-                        supabase.rpc('mark_done', _md_args).execute()
-                    else:
-                        raise
-            else:
-                raise
+        _rpc_mark_done(supabase, _md_args)
         # 失敗完了ログ
         try:
-            wid = getattr(worker, 'worker_id', 0)
             _get_lifecycle_logger().info(
                 f"process_done: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}, success=False, reason=NOT_FOUND"
             )
@@ -1838,23 +2037,9 @@ async def _process_one(
             'p_submitted_at': jst_now().isoformat(),
             'p_run_id': run_id,
         }
-        try:
-            supabase.rpc(FN_MARK_DONE, _md_args).execute()
-        except Exception as e_md2:
-            if _should_fallback_on_rpc_error(e_md2, FN_MARK_DONE, ['p_run_id']):
-                _md_args.pop('p_run_id', None)
-                try:
-                    supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                except Exception as e_md2_f:
-                    if (not USE_EXTRA_TABLE) and _should_fallback_on_rpc_error(e_md2_f, FN_MARK_DONE, []):
-                        supabase.rpc('mark_done', _md_args).execute()
-                    else:
-                        raise
-            else:
-                raise
+        _rpc_mark_done(supabase, _md_args)
         # 失敗完了ログ
         try:
-            wid = getattr(worker, 'worker_id', 0)
             _get_lifecycle_logger().info(
                 f"process_done: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}, success=False, reason=NO_FORM_URL"
             )
@@ -1878,7 +2063,7 @@ async def _process_one(
         'company_data': company,
         'client_data': client_data,
         'targeting_id': targeting_id,
-        'worker_id': getattr(worker, 'worker_id', 0)
+        'worker_id': wid
     }
 
     try:
@@ -1933,39 +2118,29 @@ async def _process_one(
 
     # 4) finalize via RPC（固定 company_id の場合も submissions 記録目的で呼ぶ。send_queue更新は0件でも問題なし）
     try:
-        # 営業禁止検出時: companies.prohibition_detected=true を反映
-        try:
-            if (not is_success) and isinstance(error_type, str) and error_type == 'PROHIBITION_DETECTED':
-                try:
-                    query = supabase.table(COMPANY_TABLE).update({'prohibition_detected': True}).eq('id', company_id)
-                    query = _apply_extra_client_filter(query, matched_extra_client)
-                    query.execute()
-                except Exception as ue:
-                    logger.warning(f"companies.prohibition_detected update failed (company_id={company_id}, suppressed): {ue}")
-        except Exception:
-            pass
-
-        # NO_MESSAGE_AREA 検出時: companies(または companies_extra).black = true を設定
-        # - ランナー分類（classify_detail.code）も含めて NO_MESSAGE_AREA と判定された場合に反映
-        # - DOMにお問い合わせ本文（textarea）が存在しないフォームは以後の送信対象から除外する
-        try:
-            code_val = None
+        # 失敗種別に応じた companies(または companies_extra) のフラグ更新を1回の UPDATE にまとめる
+        # - PROHIBITION_DETECTED: prohibition_detected=true
+        # - NO_MESSAGE_AREA（ランナー分類 classify_detail.code を含む）: black=true
+        #   DOMにお問い合わせ本文（textarea）が存在しないフォームは以後の送信対象から除外する
+        if not is_success:
             try:
-                if isinstance(classify_detail, dict):
-                    code_val = classify_detail.get('code')
+                company_patch: Dict[str, Any] = {}
+                if error_type == 'PROHIBITION_DETECTED':
+                    company_patch['prohibition_detected'] = True
+                code_val = classify_detail.get('code') if isinstance(classify_detail, dict) else None
+                if error_type == 'NO_MESSAGE_AREA' or code_val == 'NO_MESSAGE_AREA':
+                    company_patch['black'] = True
+                if company_patch:
+                    try:
+                        query = supabase.table(COMPANY_TABLE).update(company_patch).eq('id', company_id)
+                        query = _apply_extra_client_filter(query, matched_extra_client)
+                        query.execute()
+                    except Exception as ue:
+                        logger.warning(
+                            f"{COMPANY_TABLE} flag update failed (company_id={company_id}, keys={sorted(company_patch)}, suppressed): {ue}"
+                        )
             except Exception:
-                code_val = None
-            if (not is_success) and (
-                (isinstance(error_type, str) and error_type == 'NO_MESSAGE_AREA') or code_val == 'NO_MESSAGE_AREA'
-            ):
-                try:
-                    query = supabase.table(COMPANY_TABLE).update({'black': True}).eq('id', company_id)
-                    query = _apply_extra_client_filter(query, matched_extra_client)
-                    query.execute()
-                except Exception as ue:
-                    logger.warning(f"{COMPANY_TABLE}.black update failed (company_id={company_id}, suppressed): {ue}")
-        except Exception:
-            pass
+                pass
 
         # Bot保護が検出されている場合は error_type を BOT_DETECTED に寄せる（優先）
         if not is_success:
@@ -1985,10 +2160,9 @@ async def _process_one(
                 fm = ar.get('field_mapping')
                 if isinstance(fm, dict):
                     sanitized = _sanitize_field_mapping_for_storage(fm)
-                    # 空でなく JSON 化できる場合は保存
+                    # サニタイズ結果は JSON 安全な型のみで構成されるため、検証用の事前シリアライズは行わない
+                    # （RPC 送信時に supabase クライアントが1回だけエンコードする）
                     if sanitized is not None:
-                        # 念のため JSON シリアライズ検証
-                        json.dumps(sanitized, ensure_ascii=False)
                         field_mapping_to_store = sanitized
         except Exception:
             field_mapping_to_store = None
@@ -2005,30 +2179,12 @@ async def _process_one(
             'p_submitted_at': jst_now().isoformat(),
             'p_run_id': run_id,
         }
-        try:
-            supabase.rpc(FN_MARK_DONE, _md_args).execute()
-        except Exception as e_md3:
-            if _should_fallback_on_rpc_error(e_md3, FN_MARK_DONE, ['p_run_id']):
-                _md_args.pop('p_run_id', None)
-                try:
-                    supabase.rpc(FN_MARK_DONE, _md_args).execute()
-                except Exception as e_md3_f:
-                    if (not USE_EXTRA_TABLE) and _should_fallback_on_rpc_error(e_md3_f, FN_MARK_DONE, []):
-                        supabase.rpc('mark_done', _md_args).execute()
-                    else:
-                        raise
-            else:
-                raise
-        # 成功時は当日成功数キャッシュを無効化（最新値を反映させる）
+        _rpc_mark_done(supabase, _md_args)
+        # 成功時は当日成功数キャッシュをローカルで加算（TTL 内は再クエリしない）
         if is_success:
-            try:
-                key = f"{targeting_id}:{target_date.isoformat()}"
-                _SUCC_CACHE.pop(key, None)
-            except Exception:
-                pass
+            _bump_success_count_cache(targeting_id, target_date)
         # 完了ログ（成功/失敗）
         try:
-            wid = getattr(worker, 'worker_id', 0)
             if is_success:
                 _get_lifecycle_logger().info(
                     f"process_done: company_id={company_id}, worker_id={wid}, targeting_id={targeting_id}, success=True"
@@ -2054,7 +2210,7 @@ async def _process_one(
     return True, False
 
 
-def _worker_entry(worker_id: int, targeting_id: int, config_file: str, headless_opt: Optional[bool], target_date: date, shard_id: Optional[int], run_id: str, max_processed: Optional[int], fixed_company_id: Optional[int], empty_finish_flag=None):
+def _worker_entry(worker_id: int, targeting_id: int, config_file: str, headless_opt: Optional[bool], target_date: date, shard_id: Optional[int], run_id: str, max_processed: Optional[int], fixed_company_id: Optional[int], empty_finish_flag=None, preloaded_client_data: Optional[Dict[str, Any]] = None):
     # child process
     try:
         # 子プロセスにも抑制ポリシーを適用
@@ -2069,7 +2225,11 @@ def _worker_entry(worker_id: int, targeting_id: int, config_file: str, headless_
             if not ok:
                 logger.error(f"Worker {worker_id}: Playwright init failed")
                 return
-            client_data = load_client_data_simple(config_file, targeting_id)
+            # 親で検証・解析済みの設定があればそれを使い、ワーカーごとのファイル再読込とJSON再解析を省く
+            if preloaded_client_data is not None:
+                client_data = preloaded_client_data
+            else:
+                client_data = load_client_data_simple(config_file, targeting_id)
             session_start_utc = datetime.now(timezone.utc)
             max_runtime_hours = _resolve_max_runtime_hours(client_data=client_data)
             session_deadline = session_start_utc + timedelta(hours=max_runtime_hours)
@@ -2086,7 +2246,7 @@ def _worker_entry(worker_id: int, targeting_id: int, config_file: str, headless_
                 )
             except Exception:
                 pass
-            max_daily = _extract_max_daily_sends(client_data)
+            max_daily = _get_targeting_settings(client_data).max_daily_sends
             # バックオフ設定（config/worker_config.json → runner）
             try:
                 runner_cfg = get_worker_config().get('runner', {})
@@ -2148,9 +2308,10 @@ def _worker_entry(worker_id: int, targeting_id: int, config_file: str, headless_
                     )
                     return
                 # 取り残し再配布は仕事の有無に関係なく一定間隔で実行（worker_id=0 のみ）
+                # 固定 company_id 指定時はキューを claim しないため実行不要
                 try:
                     now_ts = _time.time()
-                    if worker_id == 0 and (now_ts - last_requeue_ts >= requeue_interval):
+                    if worker_id == 0 and fixed_company_id is None and (now_ts - last_requeue_ts >= requeue_interval):
                         try:
                             resp = supabase.rpc(FN_REQUEUE, {
                                 'p_target_date': str(target_date),
@@ -2433,11 +2594,13 @@ def main():
         # company_id 指定時は重複処理を避けるためワーカーは1に制限
         # 1〜4にクランプ（外部からの過大指定を抑止）
         worker_count = _resolve_worker_count(args.num_workers, args.company_id)
+        # 読込エラー時は従来どおり各ワーカーがファイルから読み直す
+        shared_client_data = client_data_preview if client_data_preview and 'error' not in client_data_preview else None
         logger.info("Worker count resolved to %s (requested=%s)", worker_count, args.num_workers)
         for wid in range(worker_count):
             pr = mp.Process(
                 target=_worker_entry,
-                args=(wid, args.targeting_id, config_path, headless_opt, t_date, args.shard_id, run_id, args.max_processed, args.company_id, empty_finish_flag),
+                args=(wid, args.targeting_id, config_path, headless_opt, t_date, args.shard_id, run_id, args.max_processed, args.company_id, empty_finish_flag, shared_client_data),
                 name=f'fs-worker-{wid}'
             )
             pr.daemon = False
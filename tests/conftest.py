@@ -1,6 +1,9 @@
+import asyncio
 import sys
 import types
 
+import pytest
+
 
 def _install_playwright_stub():
     if "playwright.async_api" in sys.modules:
@@ -67,3 +70,20 @@ def _install_playwright_stub():
 
 
 _install_playwright_stub()
+
+
+@pytest.fixture
+def run_in_new_loop():
+    """コルーチンを専用のイベントループで実行する関数を返す。
+
+    asyncio.run() は終了時に既定イベントループを解除し、get_event_loop() を使う他テストを壊すため使わない。
+    """
+
+    def _run(coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    return _run
@@ -0,0 +1,74 @@
+
+from src.form_sender.detection import bot_detector
+from src.form_sender.detection.bot_detector import BotDetectionSystem
+
+
+class _ProbePage:
+    def __init__(self, probe):
+        self._probe = probe
+        self.evaluate_calls = 0
+
+    async def evaluate(self, _script, _arg=None):
+        self.evaluate_calls += 1
+        return self._probe
+
+
+def test_recaptcha_probe_uses_single_evaluate_for_visible_widget(run_in_new_loop):
+    page = _ProbePage({"anchor": 1, "sitekey": 1, "visible": True})
+
+    assert run_in_new_loop(BotDetectionSystem._detect_strict_recaptcha(page)) == (True, "reCAPTCHA")
+    assert page.evaluate_calls == 1
+
+
+def test_recaptcha_probe_scores_invisible_signals(run_in_new_loop):
+    page = _ProbePage({"s": 1, "has_grecaptcha": True})
+    assert run_in_new_loop(BotDetectionSystem._detect_strict_recaptcha(page)) == (True, "reCAPTCHA")
+    assert page.evaluate_calls == 1
+
+    weak = _ProbePage({"b": 1})
+    assert run_in_new_loop(BotDetectionSystem._detect_strict_recaptcha(weak)) == (False, None)
+
+
+class _CloudflarePage(_ProbePage):
+    def __init__(self, url, probe, normal):
+        super().__init__(probe)
+        self.url = url
+        self._normal = normal
+
+    async def evaluate(self, script, arg=None):
+        if script == bot_detector._NORMAL_PAGE_PROBE_JS:
+            self.evaluate_calls += 1
+            return self._normal
+        return await super().evaluate(script, arg)
+
+
+def test_cloudflare_probe_skips_browser_calls_off_challenge_url(run_in_new_loop):
+    page = _CloudflarePage("https://example.com/contact", {}, normal=False)
+    assert run_in_new_loop(BotDetectionSystem._detect_strict_cloudflare(page)) == (False, None)
+    assert page.evaluate_calls == 0
+
+
+def test_cloudflare_probe_detects_challenge_in_one_evaluate(run_in_new_loop):
+    probe = {"title": "Just a moment...", "cf_element": True, "cf_text": True, "is_normal": False}
+    page = _CloudflarePage("https://example.com/cdn-cgi/challenge-platform/h/b", probe, normal=True)
+    assert run_in_new_loop(BotDetectionSystem._detect_strict_cloudflare(page)) == (True, "Cloudflare Challenge")
+
+    assert page.evaluate_calls == 1
+
+    no_text = _CloudflarePage(page.url, dict(probe, cf_text=False), normal=False)
+    assert run_in_new_loop(BotDetectionSystem._detect_strict_cloudflare(no_text)) == (False, None)
+    assert no_text.evaluate_calls == 1
+
+
+def test_probe_scripts_embed_thresholds():
+    assert str(bot_detector.BotDetectionThresholds.NORMAL_PAGE_MIN_TEXT_LENGTH) in bot_detector._NORMAL_PAGE_PROBE_JS
+    assert bot_detector._NORMAL_PAGE_PROBE_JS in bot_detector._CLOUDFLARE_PROBE_JS
+
+
+def test_detect_bot_protection_checks_normal_page_at_most_once(run_in_new_loop):
+    probe = {"title": "Just a moment...", "cf_element": True, "cf_text": True, "is_normal": True}
+    page = _CloudflarePage("https://example.com/cdn-cgi/challenge-platform/h/b", probe, normal=False)
+
+    assert run_in_new_loop(BotDetectionSystem.detect_bot_protection(page)) == (False, None)
+    # reCAPTCHA / Cloudflare（通常ページ判定込み）の各1回
+    assert page.evaluate_calls == 2
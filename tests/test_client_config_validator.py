@@ -1,4 +1,5 @@
 import copy
+import threading
 
 import pytest
 
@@ -6,6 +7,7 @@ from form_sender.config_validation import (
     ClientConfigValidationError,
     clear_config_cache,
     transform_client_config,
+    transform_many,
 )
 
 
@@ -62,13 +64,54 @@ def _minimal_config():
     }
 
 
-def test_transform_client_config_normalizes_and_caches():
+def test_transform_client_config_normalizes_and_caches(monkeypatch):
+    from form_sender.config_validation import validator
+
     config = _minimal_config()
     transformed = transform_client_config(config)
     assert transformed["active"] is True
-    # cache returns same object instance for identical payload
-    transformed_again = transform_client_config(copy.deepcopy(config))
-    assert transformed_again is transformed
+
+    # キャッシュヒット時は再検証も設定全体の比較も行わず、入力自身を返す
+    calls = []
+    monkeypatch.setattr(validator, "_validate_2sheet_config", lambda cfg: calls.append(cfg))
+    again = copy.deepcopy(config)
+    transformed_again = transform_client_config(again)
+    assert transformed_again is again
+    assert transformed_again == transformed
+    assert calls == []
+
+
+def test_transform_client_config_cache_ignores_unread_fields_but_returns_own_config():
+    config = _minimal_config()
+    transformed = transform_client_config(config)
+
+    other = _minimal_config()
+    other["targeting"]["targeting_sql"] = "id > 100"
+    result = transform_client_config(other)
+    assert result is other
+    assert result is not transformed
+    assert result["targeting"]["targeting_sql"] == "id > 100"
+
+
+def test_transform_client_config_cache_distinguishes_value_types():
+    config = _minimal_config()
+    transform_client_config(config)
+
+    bad = _minimal_config()
+    bad["targeting"]["send_days_of_week"] = [0.0, 1, 2, 3, 4]
+    with pytest.raises(ClientConfigValidationError):
+        transform_client_config(bad)
+
+
+def test_cache_key_distinguishes_client_value_types():
+    from form_sender.config_validation.validator import _get_cache_key
+
+    keys = set()
+    for value in (1, 1.0, True):
+        config = _minimal_config()
+        config["client"]["phone_1"] = value
+        keys.add(_get_cache_key(config))
+    assert len(keys) == 3
 
 
 def test_transform_client_config_normalizes_active_flag():
@@ -94,8 +137,91 @@ def test_transform_client_config_allows_optional_blanks():
     assert transformed["client"]["email_2"] == ""
 
 
+def test_client_optional_fields_exclude_unchecked_keys():
+    from form_sender.config_validation.validator import _CLIENT_OPTIONAL_FIELDS
+
+    assert _CLIENT_OPTIONAL_FIELDS == ("email_2", "postal_code_2", "address_4", "phone_2", "phone_3")
+
+
 def test_transform_client_config_invalid_time_format_raises():
     config = _minimal_config()
     config["targeting"]["send_start_time"] = "9AM"
     with pytest.raises(ClientConfigValidationError):
         transform_client_config(config)
+
+
+def test_transform_client_config_cache_is_thread_local():
+    config = _minimal_config()
+    transformed = transform_client_config(config)
+
+    results = []
+    worker = threading.Thread(target=lambda: results.append(transform_client_config(copy.deepcopy(config))))
+    worker.start()
+    worker.join()
+
+    assert results[0] == transformed
+    assert results[0] is not transformed
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [(True, True), (False, False), (1, True), (0, False), (" Yes ", True), ("off", False), ("", False)],
+)
+def test_transform_client_config_active_variants(raw, expected):
+    config = _minimal_config()
+    config["active"] = raw
+    assert transform_client_config(config)["active"] is expected
+
+
+def test_transform_client_config_invalid_active_raises():
+    config = _minimal_config()
+    config["active"] = "maybe"
+    with pytest.raises(ClientConfigValidationError):
+        transform_client_config(config)
+
+
+@pytest.mark.parametrize("days", [[0, 7], [-1], [1.0], ["1"]])
+def test_transform_client_config_invalid_send_days_raises(days):
+    config = _minimal_config()
+    config["targeting"]["send_days_of_week"] = days
+    with pytest.raises(ClientConfigValidationError):
+        transform_client_config(config)
+
+
+def test_transform_client_config_reuses_plain_dict_unless_copy_requested():
+    config = _minimal_config()
+    assert transform_client_config(config) is config
+    assert config["active"] is True
+
+    clear_config_cache()
+    original = _minimal_config()
+    transformed = transform_client_config(original, copy=True)
+    assert transformed is not original
+    assert original["active"] == "true"
+
+
+def test_transform_many_preserves_order_and_shares_cache(monkeypatch):
+    from form_sender.config_validation import validator
+
+    validated = []
+    real_validate = validator._validate_2sheet_config
+    monkeypatch.setattr(validator, "_validate_2sheet_config", lambda cfg: validated.append(cfg) or real_validate(cfg))
+    first = _minimal_config()
+    second = _minimal_config()
+    second["targeting_id"] = 102
+    duplicate = copy.deepcopy(first)
+
+    results = transform_many([first, second, duplicate])
+
+    assert [r["targeting_id"] for r in results] == [101, 102, 101]
+    assert results[2] is duplicate and results[2] == results[0]
+    again = _minimal_config()
+    assert transform_client_config(again) is again
+    assert validated == [first, second]
+
+
+def test_transform_many_raises_on_invalid_entry():
+    broken = _minimal_config()
+    del broken["targeting"]["subject"]
+    with pytest.raises(ClientConfigValidationError):
+        transform_many([_minimal_config(), broken])
@@ -0,0 +1,14 @@
+from src.form_sender.template import company_processor
+from src.form_sender.template.company_processor import CompanyPlaceholderAnalyzer
+
+
+def test_required_company_columns_cached_per_template():
+    company_processor._required_company_columns.cache_clear()
+    config = {"subject": "{company_name}様へのご提案", "message": "[{representative}様]\n{client.company_name}"}
+
+    first = CompanyPlaceholderAnalyzer.get_required_company_columns(config)
+    first.add("mutated")
+    second = CompanyPlaceholderAnalyzer.get_required_company_columns(dict(config))
+
+    assert second == {"company_name", "representative"}
+    assert company_processor._required_company_columns.cache_info().hits == 1
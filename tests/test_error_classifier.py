@@ -72,3 +72,11 @@ def test_external_config_patterns_rate_limit():
         submit_selector=".btn",
     )
     assert code == "RATE_LIMIT"
+
+
+def test_is_recoverable_error_uses_type_sets_and_message_markers():
+    assert ErrorClassifier.is_recoverable_error("TIMEOUT", "navigation timed out") is True
+    assert ErrorClassifier.is_recoverable_error("TIMEOUT", "JSON Decode failure in payload") is False
+    assert ErrorClassifier.is_recoverable_error("MAPPING", "anything") is False
+    assert ErrorClassifier.is_recoverable_error("UNKNOWN_TYPE", "") is False
+    assert ErrorClassifier.is_recoverable_error("SYSTEM", "") is True
@@ -0,0 +1,36 @@
+
+from src.form_sender.analyzer.field_mapper import FieldMapper
+
+
+class _QuickScorer:
+    def __init__(self, scores):
+        self._scores = scores
+
+    async def calculate_element_score_quick(self, element, field_patterns, field_name):
+        return self._scores[element]
+
+
+def _mapper(scores, **settings):
+    return FieldMapper(
+        page=None,
+        element_scorer=_QuickScorer(scores),
+        context_text_extractor=None,
+        field_patterns=None,
+        duplicate_prevention=None,
+        settings={'quick_top_k': 3, 'quick_top_k_essential': 5, 'essential_fields': ['メールアドレス'], **settings},
+        create_enhanced_element_info_func=None,
+        generate_temp_value_func=None,
+        field_combination_manager=None,
+    )
+
+
+def test_quick_rank_returns_top_k_in_score_order_with_stable_ties(run_in_new_loop):
+    scores = {'a': 10, 'b': 50, 'c': 30, 'd': 50, 'e': -999, 'f': 5, 'used': 100}
+    mapper = _mapper(scores)
+    used = {id('used')}
+
+    ranked = run_in_new_loop(mapper._quick_rank_candidates(list(scores), {}, '会社名', used))
+    assert ranked == ['b', 'd', 'c']
+
+    essential = run_in_new_loop(mapper._quick_rank_candidates(list(scores), {}, 'メールアドレス', used))
+    assert essential == ['b', 'd', 'c', 'a', 'f']
@@ -0,0 +1,377 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from form_finder.orchestrator.manager import FormFinderOrchestrator  # noqa: E402
+from form_sender.communication.queue_manager import ResultStatus, WorkerResult  # noqa: E402
+
+
+def _bare_orchestrator():
+    orch = FormFinderOrchestrator.__new__(FormFinderOrchestrator)
+    orch.results = []
+    orch.results_lock = orch.stats_lock = threading.Lock()
+    orch.total_processed = 0
+    orch.total_successful = 0
+    orch.total_failed = 0
+    orch.business_successful = 0
+    orch.business_failed = 0
+    orch.total_forms_found = 0
+    orch.last_health_status = {}
+    orch.last_health_check_at = float("-inf")
+    orch.health_check_interval = 30
+    return orch
+
+
+def test_collect_worker_result_updates_technical_and_business_stats(run_in_new_loop):
+    orch = _bare_orchestrator()
+    found = WorkerResult(
+        task_id="t1", worker_id=0, status=ResultStatus.SUCCESS, record_id=1,
+        additional_data={"form_urls": ["https://a/contact", "https://a/inquiry"]},
+    )
+    empty = WorkerResult(task_id="t2", worker_id=0, status=ResultStatus.SUCCESS, record_id=2)
+    failed = WorkerResult(
+        task_id="t3", worker_id=1, status=ResultStatus.ERROR, record_id=3, error_message="boom",
+        additional_data={"form_urls": ["https://c/contact"]},
+    )
+
+    for result in (found, empty, failed):
+        run_in_new_loop(orch._collect_worker_result(result))
+
+    assert (orch.total_processed, orch.total_successful, orch.total_failed) == (3, 2, 1)
+    assert (orch.business_successful, orch.business_failed, orch.total_forms_found) == (2, 1, 3)
+    by_id = {r["record_id"]: r for r in orch.results}
+    assert by_id[1]["form_found"] is True and by_id[1]["error_message"] is None
+    assert by_id[2]["business_status"] == "failed"
+    assert by_id[3]["form_found"] is False
+    assert by_id[3]["status"] == "failed" and by_id[3]["error_message"] == "boom"
+
+
+class _IdleQueueManager:
+    def check_worker_health(self):
+        return {}
+
+    def get_stats(self):
+        return {}
+
+
+def test_processing_summary_elapsed_uses_monotonic_clock(monkeypatch):
+    orch = _bare_orchestrator()
+    orch.batch_id = "b1"
+    orch.batch_data = []
+    orch.num_workers = 0
+    orch.worker_processes = []
+    orch.worker_status = {}
+    orch._status_lock = threading.Lock()
+    orch.queue_manager = _IdleQueueManager()
+    orch.orchestrator_stats = {"batches_processed": 0, "total_companies_sent": 0, "total_results_received": 0}
+    orch.start_time = 100.0
+
+    monkeypatch.setattr("form_finder.orchestrator.manager.time.monotonic", lambda: 130.0)
+    # 壁時計が巻き戻っても経過時間には影響しない
+    monkeypatch.setattr("form_finder.orchestrator.manager.time.time", lambda: 0.0)
+
+    assert orch.get_processing_summary()["elapsed_time"] == 30.0
+
+
+def test_processing_summary_reports_consistent_counter_snapshot():
+    orch = _bare_orchestrator()
+    orch.batch_id = "b2"
+    orch.batch_data = [{}] * 4
+    orch.num_workers = 0
+    orch.worker_processes = []
+    orch.worker_status = {}
+    orch._status_lock = threading.Lock()
+    orch.queue_manager = _IdleQueueManager()
+    orch.orchestrator_stats = {"batches_processed": 1, "total_companies_sent": 4, "total_results_received": 3}
+    orch.start_time = 0.0
+    orch.total_processed, orch.total_successful, orch.total_failed = 3, 2, 1
+    orch.business_successful, orch.business_failed, orch.total_forms_found = 2, 1, 5
+
+    summary = orch.get_processing_summary()
+
+    assert summary["processed_count"] == 3
+    assert (summary["business_successful_count"], summary["total_forms_found"]) == (2, 5)
+    assert summary["form_discovery_rate"] == orch.calculate_form_discovery_rate() == 66.7
+    assert summary["orchestrator_stats"]["total_results_received"] == 3
+    assert FormFinderOrchestrator._discovery_rate(1, 0) == 0.0
+
+
+class _ScriptedQueueManager(_IdleQueueManager):
+    def __init__(self, statuses):
+        self._statuses = statuses
+        self._sent = 0
+
+    def send_task(self, company):
+        self._sent += 1
+        return f"task-{self._sent}"
+
+    def get_all_available_results(self):
+        statuses, self._statuses = self._statuses, []
+        return [
+            WorkerResult(task_id=f"task-{i}", worker_id=0, status=status, record_id=i)
+            for i, status in enumerate(statuses, start=1)
+        ]
+
+    def has_results(self):
+        return bool(self._statuses)
+
+    def get_results_blocking(self, timeout):
+        self.blocking_waits = getattr(self, "blocking_waits", 0) + 1
+        return self.get_all_available_results()
+
+
+def test_process_companies_batch_counts_results_by_status(caplog, run_in_new_loop):
+    orch = _bare_orchestrator()
+    orch.is_running = True
+    orch.num_workers = 1
+    orch.batch_data = [{"record_id": i, "company_url": f"https://c{i}.example"} for i in range(1, 4)]
+    orch.orchestrator_stats = {"batches_processed": 0, "total_companies_sent": 0, "total_results_received": 0}
+    orch.queue_manager = _ScriptedQueueManager(
+        [ResultStatus.WORKER_READY, ResultStatus.SUCCESS, ResultStatus.FAILED, ResultStatus.ERROR]
+    )
+
+    with caplog.at_level("INFO", logger="form_finder.orchestrator.manager"):
+        stats = run_in_new_loop(orch.process_companies_batch())
+
+    assert stats["results_received"] == 3
+    assert "送信=3件, 受信=3件, 成功=1件, 失敗=1件, エラー=1件" in caplog.text
+    assert (stats["success_count"], stats["failed_count"], stats["error_count"]) == (1, 1, 1)
+    assert orch.orchestrator_stats["total_results_received"] == 3
+
+
+def test_results_and_stats_share_one_lock_and_save_consistently(tmp_path, monkeypatch, run_in_new_loop):
+    import json
+
+    orch = FormFinderOrchestrator("b3", [], num_workers=1)
+    assert orch.results_lock is orch.stats_lock
+
+    monkeypatch.setattr("form_finder.orchestrator.manager.ARTIFACTS_DIR", tmp_path)
+    found = WorkerResult(
+        task_id="t1", worker_id=0, status=ResultStatus.SUCCESS, record_id=1,
+        additional_data={"form_urls": ["https://a/contact"]},
+    )
+    run_in_new_loop(orch._collect_worker_result(found))
+    orch.save_results()
+
+    raw = (tmp_path / "form_finder_results.json").read_text(encoding="utf-8")
+    assert "\n" not in raw
+    saved = json.loads(raw)
+    assert saved["total_processed"] == len(saved["results"]) == 1
+    assert saved["form_discovery_rate"] == 100.0
+
+
+class _CountingLock:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+
+    def __enter__(self):
+        self.acquisitions += 1
+        return self._lock.__enter__()
+
+    def __exit__(self, *exc):
+        return self._lock.__exit__(*exc)
+
+
+def test_collect_worker_results_applies_a_drain_under_one_lock_and_skips_malformed(run_in_new_loop):
+    orch = _bare_orchestrator()
+    orch.results_lock = orch.stats_lock = _CountingLock()
+    batch = [
+        WorkerResult(task_id="t1", worker_id=0, status=ResultStatus.SUCCESS, record_id=1,
+                     additional_data={"form_urls": ["https://a/contact"]}),
+        WorkerResult(task_id="t2", worker_id=0, status=ResultStatus.SUCCESS, record_id=2,
+                     additional_data=["not", "a", "dict"]),
+        WorkerResult(task_id="t3", worker_id=1, status=ResultStatus.FAILED, record_id=3),
+    ]
+
+    run_in_new_loop(orch._collect_worker_results(batch))
+
+    assert orch.stats_lock.acquisitions == 1
+    assert [r["record_id"] for r in orch.results] == [1, 3]
+    assert (orch.total_processed, orch.total_successful, orch.total_failed) == (2, 1, 1)
+    assert (orch.business_successful, orch.business_failed, orch.total_forms_found) == (1, 1, 1)
+
+
+class _FakeProcess:
+    pid = 1
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+
+def test_start_workers_returns_as_soon_as_all_workers_report_ready(monkeypatch, run_in_new_loop):
+    import queue
+    import time
+
+    orch = FormFinderOrchestrator("b4", [], num_workers=2)
+    orch.queue_manager.result_queue = results = queue.Queue()
+
+    def _ready(worker_id):
+        results.put(WorkerResult(task_id=f"ready_{worker_id}", worker_id=worker_id, status=ResultStatus.WORKER_READY))
+
+    _ready(0)
+    # 2台目は少し遅れて READY を通知する（固定1秒ポーリングなら1秒以上かかる）
+    late = threading.Timer(0.1, _ready, args=(1,))
+    monkeypatch.setattr("form_finder.orchestrator.manager.mp.Process", _FakeProcess)
+
+    started = time.monotonic()
+    late.start()
+    assert run_in_new_loop(orch.start_workers()) is True
+    assert time.monotonic() - started < 0.8
+    assert orch.worker_status == {0: "ready", 1: "ready"}
+
+
+def test_process_companies_batch_blocks_for_late_results_instead_of_sleeping(run_in_new_loop):
+    orch = _bare_orchestrator()
+    orch.is_running = True
+    orch.num_workers = 1
+    orch.batch_data = [{"record_id": 1, "company_url": "https://c1.example"}]
+    orch.orchestrator_stats = {"batches_processed": 0, "total_companies_sent": 0, "total_results_received": 0}
+    orch.queue_manager = qm = _ScriptedQueueManager([])
+    real_get_all = qm.get_all_available_results
+    drains = []
+
+    def _get_all():
+        drains.append(1)
+        return real_get_all()
+
+    def _blocking(timeout):
+        # 空のキューではノンブロッキング取得を行わず待機し、待機中に結果が届く
+        qm.blocking_waits = getattr(qm, "blocking_waits", 0) + 1
+        return [WorkerResult(task_id="task-1", worker_id=0, status=ResultStatus.SUCCESS, record_id=1)]
+
+    qm.get_all_available_results = _get_all
+    qm.get_results_blocking = _blocking
+
+    stats = run_in_new_loop(orch.process_companies_batch())
+
+    assert stats["success_count"] == 1
+    assert qm.blocking_waits == 1
+    assert drains == []
+
+
+def test_queue_manager_has_results_reflects_queue_state():
+    import queue
+
+    from form_sender.communication.queue_manager import QueueManager
+
+    manager = QueueManager(1)
+    manager.result_queue = queue.Queue()
+    assert manager.has_results() is False
+    manager.result_queue.put(WorkerResult(task_id="t", worker_id=0, status=ResultStatus.WORKER_READY))
+    assert manager.has_results() is True
+
+
+def _run_stalled_batch(monkeypatch, caplog, run_in_new_loop, configure):
+    """無活動のまま40分のタイムアウトまで回るバッチを実行し、(stats, ヘルスチェック回数) を返す"""
+    orch = _bare_orchestrator()
+    orch.is_running = True
+    orch.num_workers = 1
+    orch.batch_data = [{"record_id": 1, "company_url": "https://c1.example"}]
+    orch.orchestrator_stats = {"batches_processed": 0, "total_companies_sent": 0, "total_results_received": 0}
+    orch.queue_manager = _ScriptedQueueManager([])
+    health_checks = []
+    orch.check_worker_health = lambda: health_checks.append(1) or {0: "dead"}
+    configure(orch)
+
+    # 1周ごとに10秒進む時計（40分のタイムアウトまで無活動のまま回り続ける）
+    now = [0.0]
+
+    def _clock():
+        now[0] += 10.0
+        return now[0]
+
+    monkeypatch.setattr("form_finder.orchestrator.manager.time.monotonic", _clock)
+
+    with caplog.at_level("INFO", logger="form_finder.orchestrator.manager"):
+        stats = run_in_new_loop(orch.process_companies_batch())
+    return stats, len(health_checks)
+
+
+def test_stalled_batch_reuses_monitor_health_snapshot_and_throttles_progress_logs(monkeypatch, caplog, run_in_new_loop):
+    def _fresh_snapshot(orch):
+        # 監視タスクが直近に記録した状態（監視間隔内とみなす）
+        orch.last_health_status = {0: "unresponsive"}
+        orch.last_health_check_at = 0.0
+        orch.health_check_interval = 1e9
+
+    stats, health_checks = _run_stalled_batch(monkeypatch, caplog, run_in_new_loop, _fresh_snapshot)
+
+    assert stats["results_received"] == 0
+    # ループ内では同期ヘルスチェックを行わず、タイムアウト後の最終分析の1回のみ
+    assert health_checks == 1
+    assert "ワーカー健康状態: {0: 'unresponsive'}" in caplog.text
+    progress_logs = caplog.text.count("処理進捗:")
+    assert 0 < progress_logs <= 2400 // 30
+
+
+def test_stalled_batch_checks_health_directly_when_monitor_snapshot_is_stale(monkeypatch, caplog, run_in_new_loop):
+    # 監視タスク未起動（記録なし）の場合は直接確認する
+    stats, health_checks = _run_stalled_batch(monkeypatch, caplog, run_in_new_loop, lambda orch: None)
+
+    assert stats["results_received"] == 0
+    assert health_checks > 1
+    assert "ワーカー健康状態: {0: 'dead'}" in caplog.text
+
+
+def test_per_result_debug_log_is_emitted_only_when_debug_enabled(caplog, run_in_new_loop):
+    def _run_batch():
+        orch = _bare_orchestrator()
+        orch.is_running = True
+        orch.num_workers = 1
+        orch.batch_data = [{"record_id": 1, "company_url": "https://c1.example"}]
+        orch.orchestrator_stats = {"batches_processed": 0, "total_companies_sent": 0, "total_results_received": 0}
+        orch.queue_manager = _ScriptedQueueManager([ResultStatus.SUCCESS])
+        return run_in_new_loop(orch.process_companies_batch())
+
+    with caplog.at_level("INFO", logger="form_finder.orchestrator.manager"):
+        assert _run_batch()["success_count"] == 1
+    assert "Processed result for company" not in caplog.text
+
+    caplog.clear()
+    with caplog.at_level("DEBUG", logger="form_finder.orchestrator.manager"):
+        _run_batch()
+    assert "Processed result for company 1: success" in caplog.text
+
+
+def test_cancelled_batch_wait_still_collects_results_taken_by_the_thread(run_in_new_loop):
+    import time
+
+    orch = _bare_orchestrator()
+    orch.is_running = True
+    orch.num_workers = 1
+    orch.batch_data = [{"record_id": 1, "company_url": "https://c1.example"}]
+    orch.orchestrator_stats = {"batches_processed": 0, "total_companies_sent": 0, "total_results_received": 0}
+    orch.queue_manager = qm = _ScriptedQueueManager([])
+    taken = threading.Event()
+
+    def _slow_blocking(timeout):
+        # キャンセル後にキューから結果を取り出す待機スレッド
+        time.sleep(0.1)
+        taken.set()
+        return [WorkerResult(task_id="task-1", worker_id=0, status=ResultStatus.SUCCESS, record_id=1)]
+
+    qm.get_results_blocking = _slow_blocking
+
+    async def _run():
+        task = asyncio.ensure_future(orch.process_companies_batch())
+        await asyncio.sleep(0.02)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return "cancelled"
+
+    assert run_in_new_loop(_run()) == "cancelled"
+    assert taken.is_set()
+    assert [r["record_id"] for r in orch.results] == [1]
+    assert orch.total_processed == 1
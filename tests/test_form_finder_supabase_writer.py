@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from form_finder import supabase_writer  # noqa: E402
+from form_finder.supabase_writer import SupabaseFormFinderWriter  # noqa: E402
+
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        count = len(params["record_ids"])
+        return type("_Call", (), {"execute": lambda _self: _Response(count)})()
+
+
+def _writer():
+    writer = SupabaseFormFinderWriter.__new__(SupabaseFormFinderWriter)
+    writer.supabase = _RecordingClient()
+    writer.target_table = "companies"
+    return writer
+
+
+def test_save_results_validates_each_form_url_once(monkeypatch):
+    checked = []
+    real = supabase_writer.is_valid_form_url
+    monkeypatch.setattr(supabase_writer, "is_valid_form_url", lambda url: checked.append(url) or real(url))
+    writer = _writer()
+    results = [
+        {"record_id": 1, "status": "success", "form_urls": [" https://example.com/contact "]},
+        {"record_id": 2, "status": "success", "form_urls": ["javascript:void(0)"]},
+        {"record_id": 3, "status": "failed", "form_urls": []},
+    ]
+
+    assert writer.save_form_finder_results("b1", results, "success") is True
+
+    assert checked == ["https://example.com/contact", "javascript:void(0)"]
+    success_call, failure_call = writer.supabase.calls
+    assert success_call == (
+        "bulk_update_form_finder_success",
+        {"record_ids": [1], "form_url_mapping": {1: "https://example.com/contact"}},
+    )
+    assert failure_call == ("bulk_update_form_finder_failure", {"record_ids": [2, 3]})
+
+
+def test_batch_update_success_validates_when_called_without_prevalidated_urls():
+    writer = _writer()
+    results = [
+        {"record_id": 5, "form_urls": ["https://example.com/inquiry/"]},
+        {"record_id": 6, "form_urls": []},
+    ]
+
+    assert writer._batch_update_success_results(results) == 1
+    name, params = writer.supabase.calls[0]
+    assert params == {"record_ids": [5], "form_url_mapping": {5: "https://example.com/inquiry/"}}
@@ -264,3 +264,17 @@ def test_main_preserves_cloud_run_env(monkeypatch, tmp_path):
     module.main()
 
     assert os.environ.get("FORM_SENDER_ENV") == "cloud_run"
+
+
+def test_atomic_write_json_writes_compact_roundtrip(monkeypatch, tmp_path):
+    module = _reload_module(monkeypatch)
+    path = tmp_path / "client_config_compact.json"
+    data = {"client": {"company_name": "テスト株式会社"}, "targeting": {"id": 1, "days": [0, 1]}}
+
+    module.atomic_write_json(path, data)
+
+    text = path.read_text(encoding="utf-8")
+    assert "\n" not in text
+    assert ", " not in text and ": " not in text
+    assert json.loads(text) == data
+    assert not list(tmp_path.glob(".*.tmp"))
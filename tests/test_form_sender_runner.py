@@ -1,3 +1,5 @@
+import asyncio
+import json
 import os
 import sys
 import types
@@ -194,3 +196,378 @@ def test_resolve_worker_count_respects_cpu_profile(monkeypatch):
     monkeypatch.setattr("config.manager.get_worker_config", lambda: _fake_worker_config())
 
     assert runner._resolve_worker_count(3, company_id=None) == 1
+
+
+def test_within_business_hours_reuses_parsed_schedule(monkeypatch):
+    # 2025-01-06 is a Monday (weekday=0)
+    monkeypatch.setattr(runner, "jst_now", lambda: runner.datetime(2025, 1, 6, 10, 30, tzinfo=runner.JST))
+    client_data = {"targeting": {"send_days_of_week": [0, 1], "send_start_time": "09:00", "send_end_time": "18:00"}}
+
+    assert runner._within_business_hours(client_data) is True
+    first = runner._get_send_schedule(client_data)
+    assert runner._get_send_schedule(client_data) is first
+    assert first == (frozenset({0, 1}), 9 * 60, 18 * 60)
+
+    client_data["targeting"]["send_end_time"] = "10:00"
+    assert runner._within_business_hours(client_data) is False
+
+    client_data["targeting"]["send_days_of_week"] = "[2, 3]"
+    client_data["targeting"]["send_end_time"] = "18:00"
+    assert runner._within_business_hours(client_data) is False
+
+    client_data["targeting"]["send_days_of_week"] = [0, 9, [1]]
+    assert runner._get_send_schedule(client_data)[0] == frozenset({0})
+    client_data["targeting"]["send_days_of_week"] = [7]
+    assert runner._within_business_hours(client_data) is False
+
+
+def test_name_policy_pattern_is_cached_per_keyword_set():
+    pattern = runner._get_name_policy_pattern(["病院", "a.b"])
+    assert runner._get_name_policy_pattern(["病院", "a.b"]) is pattern
+    assert pattern.search("テスト病院")
+    assert not pattern.search("axb")
+    assert runner._get_name_policy_pattern([]) is None
+
+
+def test_extract_evidence_collects_words_in_one_bounded_pass():
+    add_data = {
+        "judgment": {
+            "details": {
+                "success_matches": [{"text": "送信完了"}, {"text": ""}, "ignored"],
+                "element_success_matches": [{"text": "ありがとう" * 20}],
+                "error_matches": [{"text": f"err{i}"} for i in range(4)],
+                "visible_error_elements": [{"text": "必須"}],
+                "matched_patterns": ["strict", 123],
+            }
+        }
+    }
+
+    evidence = runner._extract_evidence_from_additional(add_data)
+
+    assert evidence["detected_success_words"] == ["送信完了", ("ありがとう" * 20)[:80]]
+    assert evidence["detected_failure_words"] == ["err0", "err1", "err2", "err3", "必須"]
+
+
+class _CountQuery:
+    def __init__(self, calls, count):
+        self._calls = calls
+        self._count = count
+        self._limit = None
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, *_args, **_kwargs):
+        return self
+
+    gte = lt = eq
+
+    def limit(self, value):
+        self._limit = value
+        return self
+
+    def execute(self):
+        self._calls.append(self._limit)
+        return types.SimpleNamespace(count=self._count, data=[{"id": 1}] * 3)
+
+
+def test_success_count_today_reads_exact_count_with_single_row(monkeypatch):
+    runner._SUCC_CACHE.clear()
+    calls = []
+    supabase = types.SimpleNamespace(table=lambda _name: _CountQuery(calls, 42))
+
+    assert runner._get_success_count_today_jst(supabase, 1, runner.date(2025, 1, 6)) == 42
+    assert calls == [1]
+    runner._SUCC_CACHE.clear()
+
+
+def test_count_same_day_submissions_runs_off_loop(run_in_new_loop):
+    calls = []
+    supabase = types.SimpleNamespace(table=lambda _name: _CountQuery(calls, 0))
+
+    async def _run():
+        task = asyncio.ensure_future(
+            asyncio.to_thread(runner._count_same_day_submissions, supabase, 1, 2, runner.date(2025, 1, 6))
+        )
+        return await task
+
+    assert run_in_new_loop(_run()) == 0
+    assert calls == [1]
+
+
+def test_bump_success_count_cache_increments_without_requery():
+    runner._SUCC_CACHE.clear()
+    calls = []
+    supabase = types.SimpleNamespace(table=lambda _name: _CountQuery(calls, 5))
+    target = runner.date(2025, 1, 6)
+
+    assert runner._get_success_count_today_jst(supabase, 7, target) == 5
+    runner._bump_success_count_cache(7, target)
+    assert runner._get_success_count_today_jst(supabase, 7, target) == 6
+    assert calls == [1]
+
+    runner._bump_success_count_cache(7, runner.date(2025, 1, 7))
+    assert f"7:{runner.date(2025, 1, 7).isoformat()}" not in runner._SUCC_CACHE
+    runner._SUCC_CACHE.clear()
+
+
+def test_should_fallback_on_rpc_error_patterns():
+    missing = Exception("function public.mark_done(jsonb) does not exist")
+    assert runner._should_fallback_on_rpc_error(missing, "mark_done", []) is True
+    param = Exception("Could not find the function with parameter p_run_id (unexpected)")
+    assert runner._should_fallback_on_rpc_error(param, "claim", ["p_run_id"]) is True
+    other = Exception("permission denied for table send_queue")
+    assert runner._should_fallback_on_rpc_error(other, "mark_done", ["p_run_id"]) is False
+
+
+def test_should_fallback_on_rpc_error_skips_transport_errors():
+    class _LoudTimeout(TimeoutError):
+        def __str__(self):
+            raise AssertionError("message should not be inspected")
+
+    assert runner._should_fallback_on_rpc_error(_LoudTimeout(), "mark_done", ["p_run_id"]) is False
+    refused = ConnectionRefusedError("function mark_done does not exist")
+    assert runner._should_fallback_on_rpc_error(refused, "mark_done", []) is False
+
+
+def test_jst_utc_bound_strings_formats_utc_range():
+    start, end = runner.jst_utc_bound_strings(runner.date(2025, 1, 6))
+    assert (start, end) == ("2025-01-05T15:00:00Z", "2025-01-06T15:00:00Z")
+    assert runner.jst_utc_bound_strings(runner.date(2025, 1, 6))[0] is start
+
+
+def test_targeting_settings_extracted_once_per_client_data(monkeypatch):
+    calls = []
+    monkeypatch.setattr(runner, "_get_name_policy_exclude_keywords", lambda: calls.append(1) or ["病院"])
+    monkeypatch.setattr(runner, "_TARGETING_SETTINGS_CACHE", None)
+    client_data = {"client": {"company_name": "株式会社テスト"}, "targeting": {"max_daily_sends": "30"}}
+
+    settings = runner._get_targeting_settings(client_data)
+    assert runner._get_targeting_settings(client_data) is settings
+    assert settings.max_daily_sends == 30
+    assert settings.name_policy_words == ("病院",)
+    assert settings.name_policy_pattern.search("市立病院")
+    assert calls == [1]
+
+    other = {"client": {}, "targeting": {}}
+    assert runner._get_targeting_settings(other).max_daily_sends is None
+
+
+def test_resolve_client_config_path_picks_newest_match(tmp_path):
+    older = tmp_path / "client_config_a.json"
+    newer = tmp_path / "client_config_b.json"
+    for i, path in enumerate((older, newer, tmp_path / "other.json", tmp_path / ".client_config_c.json")):
+        path.write_text("{}")
+        os.utime(path, (1000 + i, 1000 + i))
+
+    pattern = str(tmp_path / "client_config_*.json")
+    assert runner._resolve_client_config_path(pattern) == str(newer)
+    assert runner._resolve_client_config_path(str(older)) == str(older)
+
+    with pytest.raises(FileNotFoundError):
+        runner._resolve_client_config_path(str(tmp_path / "missing_*.json"))
+
+
+def test_sanitize_field_mapping_drops_elements_and_normalizes_values():
+    mapping = {
+        "email": {
+            "element": object(),
+            "selector": "#mail",
+            "score": float("nan"),
+            "context": {1: "label", "element": "x", "tags": ("a", "b")},
+        },
+        2: "raw",
+    }
+
+    out = runner._sanitize_field_mapping_for_storage(mapping)
+
+    assert out["email"] == {
+        "selector": "#mail",
+        "score": None,
+        "context": {"1": "label", "tags": ["a", "b"]},
+    }
+    assert out["2"] == "raw"
+
+
+def test_sanitize_field_mapping_output_is_always_json_encodable():
+    mapping = {
+        "name": {
+            "score": float("inf"),
+            "tags": {"x"},
+            "obj": object(),
+            "nested": {(1, 2): [b"bytes", -float("inf")]},
+        },
+    }
+
+    out = runner._sanitize_field_mapping_for_storage(mapping)
+
+    assert json.loads(json.dumps(out, ensure_ascii=False, allow_nan=False)) == out
+
+
+def test_classify_failure_detail_caches_detail_and_timestamp_in_parallel(monkeypatch):
+    runner._CLASSIFY_CACHE.clear()
+    runner._CLASSIFY_CACHE_TS.clear()
+    calls = []
+
+    def _classify_detail(**kwargs):
+        calls.append(kwargs)
+        return {"code": "FORM_NOT_FOUND"}
+
+    now = [1000.0]
+    monkeypatch.setattr(runner.ErrorClassifier, "classify_detail", staticmethod(_classify_detail))
+    monkeypatch.setattr(runner, "_get_classify_cache_limits", lambda: (16, 60))
+    monkeypatch.setattr(runner._time, "time", lambda: now[0])
+
+    first, _ = runner._classify_failure_detail("form missing", None, "NOT_FOUND")
+    second, _ = runner._classify_failure_detail("form missing", None, "NOT_FOUND")
+    assert first == second == {"code": "FORM_NOT_FOUND"}
+    assert len(calls) == 1
+    assert runner._CLASSIFY_CACHE.keys() == runner._CLASSIFY_CACHE_TS.keys()
+
+    now[0] += 61
+    runner._classify_failure_detail("form missing", None, "NOT_FOUND")
+    assert len(calls) == 2
+
+    runner._CLASSIFY_CACHE.clear()
+    runner._CLASSIFY_CACHE_TS.clear()
+
+
+class _RpcCall:
+    def __init__(self, calls, name, args, error):
+        self._calls = calls
+        self._name = name
+        self._args = dict(args)
+        self._error = error
+
+    def execute(self):
+        self._calls.append((self._name, self._args))
+        if self._error is not None:
+            raise self._error
+        return types.SimpleNamespace(data=1)
+
+
+def test_rpc_mark_done_drops_run_id_on_signature_mismatch(monkeypatch):
+    monkeypatch.setattr(runner, "USE_EXTRA_TABLE", False)
+    calls = []
+    errors = [Exception("Could not find the function mark_done with parameter p_run_id"), None]
+    supabase = types.SimpleNamespace(
+        rpc=lambda name, args: _RpcCall(calls, name, args, errors.pop(0))
+    )
+    md_args = {"p_company_id": 1, "p_run_id": "run-1"}
+
+    runner._rpc_mark_done(supabase, md_args)
+
+    assert [c[1] for c in calls] == [{"p_company_id": 1, "p_run_id": "run-1"}, {"p_company_id": 1}]
+    assert "p_run_id" not in md_args
+
+
+def test_rpc_mark_done_reraises_unrelated_errors():
+    boom = Exception("permission denied for function mark_done")
+    supabase = types.SimpleNamespace(rpc=lambda name, args: _RpcCall([], name, args, boom))
+    with pytest.raises(Exception, match="permission denied"):
+        runner._rpc_mark_done(supabase, {"p_run_id": "run-1"})
+
+
+def test_rpc_mark_done_remembers_company_as_sent_today(monkeypatch):
+    monkeypatch.setattr(runner, "_SENT_TODAY", {})
+    calls = []
+    supabase = types.SimpleNamespace(rpc=lambda name, args: _RpcCall(calls, name, args, None))
+    md_args = {"p_target_date": "2025-01-06", "p_targeting_id": 3, "p_company_id": 9, "p_run_id": "r"}
+
+    assert runner._is_known_sent_today(3, runner.date(2025, 1, 6), 9) is False
+    runner._rpc_mark_done(supabase, md_args)
+    assert runner._is_known_sent_today(3, runner.date(2025, 1, 6), 9) is True
+
+    runner._remember_sent_today(3, runner.date(2025, 1, 7), 10)
+    assert runner._is_known_sent_today(3, runner.date(2025, 1, 6), 9) is False
+
+
+def test_lifecycle_logger_is_configured_once(monkeypatch):
+    import logging
+
+    log = runner._get_lifecycle_logger()
+    assert log.level == logging.INFO and log.handlers
+
+    set_levels = []
+    monkeypatch.setattr(type(log), "setLevel", lambda self, level: set_levels.append(level))
+    assert runner._get_lifecycle_logger() is log
+    # 2回目以降は setLevel（=全ロガーのレベルキャッシュ破棄）を行わない
+    assert set_levels == []
+
+
+class _RecordingTableQuery:
+    def __init__(self, supabase, table_name):
+        self._supabase = supabase
+        self._table = table_name
+
+    def select(self, *_args, **_kwargs):
+        return self
+
+    def eq(self, *_args, **_kwargs):
+        return self
+
+    gte = lt = limit = eq
+
+    def execute(self):
+        self._supabase.queried.append(self._table)
+        if self._table == runner.COMPANY_TABLE:
+            return types.SimpleNamespace(data=list(self._supabase.companies))
+        return types.SimpleNamespace(count=self._supabase.dup_count, data=[])
+
+
+class _RecordingSupabase:
+    def __init__(self, companies, dup_count=0):
+        self.companies = companies
+        self.dup_count = dup_count
+        self.queried = []
+        self.marked = []
+
+    def table(self, name):
+        return _RecordingTableQuery(self, name)
+
+    def rpc(self, _name, args):
+        self.marked.append(args['p_error_type'])
+        return types.SimpleNamespace(execute=lambda: types.SimpleNamespace(data=0))
+
+
+def _process_fixed_company(run_in_new_loop, supabase, sent_today=False):
+    target = runner.date(2025, 1, 6)
+    runner._SENT_TODAY.clear()
+    if sent_today:
+        runner._remember_sent_today(1, target, 2)
+    try:
+        return run_in_new_loop(
+            runner._process_one(
+                supabase, types.SimpleNamespace(worker_id=0), 1, {}, target, "run-1", fixed_company_id=2,
+            )
+        )
+    finally:
+        runner._SENT_TODAY.clear()
+
+
+def test_process_one_checks_duplicates_after_fetching_the_company(run_in_new_loop):
+    supabase = _RecordingSupabase([{"id": 2, "company_name": "Example", "form_url": "https://e.example/contact"}], 1)
+
+    assert _process_fixed_company(run_in_new_loop, supabase) == (True, False)
+    assert supabase.queried == [runner.COMPANY_TABLE, runner.SUBMISSIONS_TABLE]
+    assert supabase.marked == ["SKIPPED_ALREADY_SENT_TODAY"]
+
+
+def test_process_one_skips_duplicate_query_for_excluded_companies(run_in_new_loop):
+    # 企業名ポリシーで除外される企業
+    excluded = _RecordingSupabase([{"id": 2, "company_name": "テスト病院", "form_url": "https://e.example/contact"}])
+    assert _process_fixed_company(run_in_new_loop, excluded) == (True, False)
+    assert excluded.marked == ["SKIPPED_BY_NAME_POLICY"]
+
+    # 企業が見つからない
+    missing = _RecordingSupabase([])
+    assert _process_fixed_company(run_in_new_loop, missing) == (True, False)
+    assert missing.marked == ["NOT_FOUND"]
+
+    # 当日送信済みと確認済み
+    known = _RecordingSupabase([{"id": 2, "company_name": "Example", "form_url": "https://e.example/contact"}])
+    assert _process_fixed_company(run_in_new_loop, known, sent_today=True) == (True, False)
+    assert known.marked == ["SKIPPED_ALREADY_SENT_TODAY"]
+
+    for supabase in (excluded, missing, known):
+        assert runner.SUBMISSIONS_TABLE not in supabase.queried
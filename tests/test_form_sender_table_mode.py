@@ -38,6 +38,7 @@ def test_apply_table_mode_default(monkeypatch):
     assert module.COMPANY_TABLE == "companies"
     assert module.SEND_QUEUE_TABLE == "send_queue"
     assert module.SUBMISSIONS_TABLE == "submissions"
+    assert module.COMPANY_SELECT_COLUMNS == "id, form_url, black, company_name"
     assert os.getenv("FORM_SENDER_TABLE_MODE_RESOLVED") == "default"
     assert os.getenv("USE_TEST_TABLE") == "0"
 
@@ -78,4 +79,5 @@ def test_apply_table_mode_cli_extra(monkeypatch):
     assert module.TABLE_MODE == "extra"
     assert module.COMPANY_TABLE == "companies_extra"
     assert module.FN_MARK_DONE == "mark_done_extra"
+    assert module.COMPANY_SELECT_COLUMNS == "id, form_url, black, company_name, client"
     assert os.getenv("USE_EXTRA_TABLE") == "1"
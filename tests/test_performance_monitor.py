@@ -0,0 +1,221 @@
+import asyncio
+import contextlib
+import dataclasses
+import gc
+import os
+import threading
+import types
+
+import pytest
+
+from src.form_sender.utils.config_loader import Diagnostics, get_performance_monitoring_config
+from src.form_sender.utils.performance_monitor import PerformanceMonitor
+
+
+@pytest.fixture(autouse=True)
+def _restore_gc_thresholds():
+    # PerformanceMonitor は生成時にプロセス全体の GC 閾値を変更するため、テスト後に元へ戻す
+    thresholds = gc.get_threshold()
+    yield
+    gc.set_threshold(*thresholds)
+
+
+class _FakeProcess:
+    pid = 4242
+
+    def __init__(self):
+        self.in_oneshot = False
+        self.reads_outside_oneshot = []
+
+    @contextlib.contextmanager
+    def oneshot(self):
+        self.in_oneshot = True
+        try:
+            yield
+        finally:
+            self.in_oneshot = False
+
+    def _read(self, name, value):
+        if not self.in_oneshot:
+            self.reads_outside_oneshot.append(name)
+        return value
+
+    def memory_info(self):
+        return self._read("memory_info", types.SimpleNamespace(rss=256 * 1024 * 1024))
+
+    def memory_percent(self):
+        return self._read("memory_percent", 12.5)
+
+    def cpu_percent(self):
+        return self._read("cpu_percent", 3.0)
+
+    def cpu_times(self):
+        return self._read("cpu_times", (1.0, 0.5))
+
+    def num_fds(self):
+        return self._read("num_fds", 17)
+
+    def connections(self):
+        return self._read("connections", [])
+
+    def num_ctx_switches(self):
+        return self._read("num_ctx_switches", types.SimpleNamespace(voluntary=9))
+
+    def name(self):
+        return self._read("name", "python")
+
+
+def test_get_current_metrics_reads_proc_inside_oneshot():
+    monitor = PerformanceMonitor()
+    monitor.process = _FakeProcess()
+
+    metrics = monitor.get_current_metrics()
+
+    assert monitor.process.reads_outside_oneshot == []
+    assert metrics.memory_usage_mb == 256.0
+    assert metrics.process_time == 1.5
+    assert metrics.file_descriptors == 17
+    assert metrics.process_name == "python"
+
+
+def test_get_current_metrics_with_real_process():
+    metrics = PerformanceMonitor().get_current_metrics()
+
+    assert metrics.process_id == os.getpid()
+    assert metrics.memory_usage_mb > 0
+
+
+def test_dynamic_interval_tightens_immediately_but_relaxes_only_when_stable():
+    monitor = PerformanceMonitor(enable_dynamic_intervals=True)
+    intervals = monitor.interval_thresholds
+    base = monitor.current_monitoring_interval
+
+    monitor._adjust_monitoring_interval("critical")
+    assert monitor.current_monitoring_interval == intervals["critical_load"]
+
+    monitor._adjust_monitoring_interval("low")
+    monitor._adjust_monitoring_interval("low")
+    assert monitor.current_monitoring_interval == intervals["critical_load"]
+
+    monitor._adjust_monitoring_interval("low")
+    assert monitor.current_monitoring_interval == intervals["low_load"]
+    assert intervals["low_load"] > base
+
+
+def test_force_gc_escalates_to_full_collection_only_when_rss_barely_drops(monkeypatch):
+    module = "src.form_sender.utils.performance_monitor"
+    monitor = PerformanceMonitor()
+    monitor.gc_escalation_min_freed_mb = 25.0
+    calls = []
+    monkeypatch.setattr(f"{module}.gc.collect", lambda generation=2: calls.append(generation) or 3)
+
+    # 若い世代の回収でRSSが閾値以上減った場合はそこで終了
+    rss = iter([500.0, 450.0])
+    monkeypatch.setattr(monitor, "_get_rss_mb", lambda: next(rss))
+    report = monitor.force_gc_and_measure()
+    assert calls == [1]
+    assert (report["gc_generation"], report["gc_collected"], report["memory_freed_mb"]) == (1, 3, 50.0)
+
+    # 解放量が閾値未満なら全世代回収へ拡大し、拡大後のRSSで効果を報告
+    calls.clear()
+    rss = iter([500.0, 490.0, 440.0])
+    report = monitor.force_gc_and_measure()
+    assert calls == [1, 2]
+    assert (report["gc_generation"], report["gc_collected"], report["memory_freed_mb"]) == (2, 6, 60.0)
+
+
+def test_gc_thresholds_are_tuned_from_config(monkeypatch):
+    module = "src.form_sender.utils.performance_monitor"
+    config = get_performance_monitoring_config()
+    assert config.gc_monitoring.collection_thresholds == [11200, 160, 160]
+
+    applied = []
+    monkeypatch.setattr(f"{module}.gc.get_threshold", lambda: (700, 10, 10))
+    monkeypatch.setattr(f"{module}.gc.set_threshold", lambda *t: applied.append(t))
+    PerformanceMonitor()
+    assert applied == [(11200, 160, 160)]
+
+    applied.clear()
+    monkeypatch.setattr(f"{module}.gc.get_threshold", lambda: (11200, 160, 160))
+    PerformanceMonitor()
+    assert applied == []
+
+
+def test_metrics_timestamps_use_jst_offset():
+    monitor = PerformanceMonitor()
+    monitor.process = _FakeProcess()
+
+    assert monitor.get_current_metrics().timestamp.endswith("+09:00")
+    assert monitor.last_interval_adjustment.utcoffset().total_seconds() == 9 * 3600
+
+
+def test_gc_object_count_is_sampled_on_interval(monkeypatch):
+    module = "src.form_sender.utils.performance_monitor"
+    monitor = PerformanceMonitor()
+    monitor.process = _FakeProcess()
+    now = [100.0]
+    calls = []
+    monkeypatch.setattr(f"{module}.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(f"{module}.gc.get_objects", lambda: calls.append(1) or [object()] * len(calls))
+
+    assert monitor.get_current_metrics().gc_objects == 1
+    now[0] += monitor.GC_OBJECTS_SAMPLE_INTERVAL - 1
+    assert monitor.get_current_metrics().gc_objects == 1
+    assert len(calls) == 1
+
+    now[0] += 1
+    assert monitor.get_current_metrics().gc_objects == 2
+    assert monitor._get_gc_object_count(force=True) == 3
+
+
+def test_monitoring_loop_samples_metrics_off_the_event_loop_thread(run_in_new_loop):
+    monitor = PerformanceMonitor(monitoring_interval=0.01, enable_dynamic_intervals=False)
+    monitor.process = _FakeProcess()
+    sample_threads = []
+    original = monitor.get_current_metrics
+
+    def _sample():
+        sample_threads.append(threading.get_ident())
+        return original()
+
+    monitor.get_current_metrics = _sample
+
+    async def _run():
+        await monitor.start_monitoring()
+        while not monitor.metrics_history:
+            await asyncio.sleep(0.01)
+        await monitor.stop_monitoring()
+        return threading.get_ident()
+
+    loop_thread = run_in_new_loop(_run())
+    assert sample_threads and loop_thread not in sample_threads
+
+
+def test_force_gc_measures_rss_only(monkeypatch):
+    monitor = PerformanceMonitor()
+    monitor.process = _FakeProcess()
+    monkeypatch.setattr("src.form_sender.utils.performance_monitor.gc.collect", lambda generation=2: 1)
+
+    report = monitor.force_gc_and_measure()
+
+    # RSSが減らないため全世代回収へ拡大し、前後と拡大後の計3回だけ読む
+    assert monitor.process.reads_outside_oneshot == ["memory_info"] * 3
+    assert report["memory_before_mb"] == report["memory_after_mb"] == 256.0
+    assert report["memory_freed_mb"] == 0.0
+
+
+def test_connection_count_is_collected_only_with_debug_diagnostics(monkeypatch):
+    module = "src.form_sender.utils.performance_monitor"
+    config = get_performance_monitoring_config()
+    assert config.diagnostics.debug_diagnostics is False
+
+    monitor = PerformanceMonitor()
+    monitor.process = _FakeProcess()
+    assert monitor.debug_diagnostics is False
+    assert monitor.get_current_metrics().network_connections is None
+
+    debug_config = dataclasses.replace(config, diagnostics=Diagnostics(debug_diagnostics=True))
+    monkeypatch.setattr(f"{module}.get_performance_monitoring_config", lambda: debug_config)
+    debug_monitor = PerformanceMonitor()
+    debug_monitor.process = _FakeProcess()
+    assert debug_monitor.get_current_metrics().network_connections == 0
@@ -0,0 +1,73 @@
+import queue
+
+from src.form_sender.communication import queue_manager as qm
+from src.form_sender.communication.queue_manager import QueueManager, ResultStatus, WorkerResult
+
+
+def _manager_with_local_queues(num_workers=1):
+    manager = QueueManager(num_workers)
+    manager.task_queue = queue.Queue()
+    manager.result_queue = queue.Queue()
+    return manager
+
+
+def test_completed_history_is_bounded_but_stats_count_everything(monkeypatch):
+    monkeypatch.setattr(qm, "COMPLETED_HISTORY_SIZE", 3)
+    manager = _manager_with_local_queues()
+    assert manager.completed_tasks.maxlen == 3
+
+    for i in range(5):
+        task_id = manager.send_task({"id": i})
+        manager.result_queue.put(
+            WorkerResult(task_id=task_id, worker_id=0, status=ResultStatus.SUCCESS, record_id=i).to_dict()
+        )
+
+    assert len(manager.get_all_available_results()) == 5
+    assert [r.record_id for r in manager.completed_tasks] == [2, 3, 4]
+    stats = manager.get_stats()
+    assert stats["completed_tasks"] == 5
+    assert stats["pending_tasks"] == 0
+
+
+def test_worker_result_is_slotted_and_roundtrips_through_dict():
+    import pickle
+
+    result = WorkerResult(
+        task_id="t1", worker_id=2, status=ResultStatus.PROHIBITION_DETECTED, record_id=7,
+        additional_data={"form_urls": ["https://a/contact"]},
+    )
+    assert not hasattr(result, "__dict__")
+
+    data = result.to_dict()
+    assert data["status"] == "prohibition_detected"
+    assert WorkerResult.from_dict(pickle.loads(pickle.dumps(data))) == result
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_get_results_blocking_waits_for_first_result_then_drains():
+    manager = _manager_with_local_queues(num_workers=2)
+    assert manager.get_results_blocking(0.01) == []
+
+    for worker_id in (0, 1):
+        manager.result_queue.put(
+            WorkerResult(task_id=f"ready_{worker_id}", worker_id=worker_id, status=ResultStatus.WORKER_READY).to_dict()
+        )
+
+    results = manager.get_results_blocking(1.0)
+    assert [r.worker_id for r in results] == [0, 1]
+    assert manager.worker_status == {0: "ready", 1: "ready"}
+
+
+def test_worker_health_ages_heartbeats_on_the_monotonic_clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(qm.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(qm.time, "time", lambda: 0.0)  # 壁時計の巻き戻りは影響しない
+    manager = _manager_with_local_queues(num_workers=2)
+    manager.result_queue.put(WorkerResult(task_id="r0", worker_id=0, status=ResultStatus.WORKER_READY).to_dict())
+    manager.get_all_available_results()
+    manager.worker_status[1] = "ready"  # ハートビート未受信
+
+    now[0] += 130
+    health = manager.check_worker_health(heartbeat_timeout=120)
+    assert health == {0: "degraded", 1: "unresponsive"}
+    assert manager.get_stats()["elapsed_time"] == 130
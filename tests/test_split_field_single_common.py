@@ -63,3 +63,26 @@ def test_single_address_value_combined():
     a = d.generate_field_assignments([g], _client_data())
     assert a['住所'].startswith('東京都渋谷区渋谷1-2-3')
 
+
+
+def test_detector_summary_counts_patterns():
+    d = SplitFieldDetector()
+
+    def _group(pattern, confidence, valid):
+        return SplitFieldGroup(
+            pattern=pattern, field_type='', fields=[], confidence=confidence,
+            sequence_valid=valid, description='', input_strategy='split',
+            strategy_confidence=1.0, strategy_reason='',
+        )
+
+    groups = [
+        _group(SplitPattern.PHONE_3_SPLIT, 1.0, True),
+        _group(SplitPattern.PHONE_3_SPLIT, 0.5, False),
+        _group(SplitPattern.POSTAL_2_SPLIT, 0.75, True),
+    ]
+    summary = d.get_detector_summary(groups)
+    assert summary['patterns'] == {'phone_3_split': 2, 'postal_2_split': 1}
+    assert type(summary['patterns']) is dict
+    assert summary['avg_confidence'] == 0.75
+    assert summary['valid_sequences'] == 2
+    assert d.get_detector_summary([])['avg_confidence'] == 0.0